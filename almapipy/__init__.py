@@ -6,7 +6,16 @@ __version__ = "0.0.9"
 
 import os
 
-from .client import Client
+from .client import Client, LazySubClient, build_session
+from .params import CnxnParams
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .cache import Cache, MemoryCache, DiskCache
+from .bulk import BulkResult, bulk_create
+from .journal import Journal
+from .jsonlib import get_loads
+from .metrics import CallEvent, MetricsCollector, StatsdSink
+from .cassette import Cassette
 from .bibs import SubClientBibs
 from .analytics import SubClientAnalytics
 from .courses import SubClientCourses
@@ -17,6 +26,7 @@ from .partners import SubClientPartners
 from .electronic import SubClientElectronic
 from .task_lists import SubClientTaskList
 from .primo import SubClientPrimoSearch
+from .aio import AsyncCnxn
 from . import utils
 
 
@@ -30,14 +40,71 @@ class AlmaCnxn(Client):
     > alma = AlmaCnxn(your_api_key)
     > alma.bibs.catalog.get_record(bib_id) # returns bibliographic records
 
+    The connection keeps a pool of open HTTP connections. Close it when done,
+    or use it as a context manager:
+    > with AlmaCnxn(your_api_key) as alma:
+    >     alma.users.get(user_id)
+
     Args:
         api_key (str): Your Api Key
         Location (str): Geographic location of library.
         data_format (str): Format of returned data. json or xml.
             If xml is selected, data will be returned as python xml ElementTree.
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Max number of keep-alive connections per host.
+        pool_block (bool): Wait for a free pooled connection instead of
+            opening an extra one when all are in use.
+        keep_alive (bool): Reuse connections between calls.
+        session (requests.Session): Use an existing session instead of
+            building one. Overrides the pool arguments.
+        base_uri (str): Overrides the host picked by location,
+            e.g. to go through a proxy or a local stub server.
+        max_workers (int): Number of pages requested in parallel
+            when retrieving all_records. Keep at or below pool_maxsize.
+        rate_limit (float): Max calls per second across all namespaces.
+            Set it below your institution's Alma threshold.
+        quota_floor (int): Stop calling the API when this few daily calls
+            are left. The count left is at alma.rate_limiter.remaining.
+        rate_limiter (RateLimiter): Share an existing limiter, e.g. between
+            several connections using the same key. Overrides the above.
+        max_retries (int): Retries of GET calls that fail with a 429, 5xx
+            or a dropped connection, with exponential backoff. 0 disables.
+        retry_policy (RetryPolicy): Full retry settings. Overrides max_retries.
+            SubClients can be given their own, e.g.
+            alma.analytics.reports.retry_policy = RetryPolicy(max_retries=10)
+        cache (Cache): Cache for parsed GET responses, e.g. MemoryCache()
+            or DiskCache(path). By default only configuration endpoints
+            (code tables, libraries, departments, open hours) are cached,
+            and other records are revalidated with conditional GETs.
+            Hit and miss counters are at alma.cache.stats().
+        json_backend (str or callable): Parser of JSON responses. 'auto'
+            picks orjson or ujson when installed, else the json module.
+            'orjson', 'ujson', 'json' or a callable taking bytes force one.
+        metrics (callable or list): Hooks called with a CallEvent after
+            every call: its endpoint, status, sizes, and the time spent
+            waiting, downloading and parsing. E.g. MetricsCollector()
+            for Prometheus, or StatsdSink().
+        cassette (Cassette): Record the calls made to a file, or replay
+            them from it instead of calling the API.
     """
 
-    def __init__(self, apikey, location='America', data_format='json'):
+    # Hook in the various Alma APIs; each is built on first access.
+    bibs = LazySubClient(SubClientBibs)
+    analytics = LazySubClient(SubClientAnalytics)
+    courses = LazySubClient(SubClientCourses)
+    users = LazySubClient(SubClientUsers)
+    acq = LazySubClient(SubClientAcquistions)
+    conf = LazySubClient(SubClientConfiguration)
+    partners = LazySubClient(SubClientPartners)
+    electronic = LazySubClient(SubClientElectronic)
+    task_lists = LazySubClient(SubClientTaskList)
+
+    def __init__(self, apikey, location='America', data_format='json',
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keep_alive=True, session=None, base_uri=None, max_workers=1,
+                 rate_limit=None, quota_floor=0, rate_limiter=None,
+                 max_retries=3, retry_policy=None, cache=None, json_backend='auto',
+                 metrics=None, cassette=None):
 
         super(AlmaCnxn, self).__init__()
 
@@ -52,31 +119,43 @@ class AlmaCnxn(Client):
                 message = "Valid location arguments are "
                 message += ", ".join(locations.keys())
                 raise utils.ArgError(message=message)
-        self.cnxn_params['location'] = location
-        self.cnxn_params['base_uri'] = locations[location]
+        base_uri = base_uri or locations[location]
 
         # handle preferred format
         if data_format not in ['json', 'xml']:
             message = "Format argument must be either 'json' or 'xml'"
             raise utils.ArgError(message)
-        self.cnxn_params['format'] = data_format
         ns = {'header': 'http://com/exlibris/urm/general/xmlbeans'}
-        self.cnxn_params['xml_ns'] = ns
 
         # TODO: validate api key. return list of accessible endpoints
         # call __validate_key__
-        self.cnxn_params['api_key'] = apikey
-
-        # Hook in the various Alma APIs based on what API key can access
-        self.bibs = SubClientBibs(self.cnxn_params)
-        self.analytics = SubClientAnalytics(self.cnxn_params)
-        self.courses = SubClientCourses(self.cnxn_params)
-        self.users = SubClientUsers(self.cnxn_params)
-        self.acq = SubClientAcquistions(self.cnxn_params)
-        self.conf = SubClientConfiguration(self.cnxn_params)
-        self.partners = SubClientPartners(self.cnxn_params)
-        self.electronic = SubClientElectronic(self.cnxn_params)
-        self.task_lists = SubClientTaskList(self.cnxn_params)
+
+        # One pooled session is shared by every SubClient of this connection.
+        if session is None:
+            session = build_session(pool_connections, pool_maxsize,
+                                    pool_block, keep_alive)
+        if cassette is not None:
+            cassette.mount(session)
+
+        # One limiter throttles every SubClient of this connection.
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(rate_limit, quota_floor=quota_floor)
+        self.rate_limiter = rate_limiter
+
+        # Transient failures of idempotent calls are retried with backoff.
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retries=max_retries)
+
+        # Responses of slow-changing endpoints may be served from a cache.
+        self.cache = cache
+
+        # Frozen parameters shared, never copied, by every SubClient.
+        # JSON bodies are parsed from bytes by the fastest parser available.
+        self.cnxn_params = CnxnParams(
+            location=location, base_uri=base_uri, format=data_format, xml_ns=ns,
+            api_key=apikey, session=session, max_workers=max_workers,
+            rate_limiter=rate_limiter, retry_policy=retry_policy, cache=cache,
+            json_loads=get_loads(json_backend), metrics=metrics)
 
     def __validate_key__(self, apikey):
         # loop through each api and access the /test endpoint.
@@ -99,9 +178,54 @@ class PrimoCnxn(Client):
         Location (str): Geographic location of library.
         data_format (str): Format of returned data. json or xml.
             If xml is selected, data will be returned as python xml ElementTree.
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Max number of keep-alive connections per host.
+        pool_block (bool): Wait for a free pooled connection instead of
+            opening an extra one when all are in use.
+        keep_alive (bool): Reuse connections between calls.
+        session (requests.Session): Use an existing session instead of
+            building one. Overrides the pool arguments.
+        base_uri (str): Overrides the host picked by location,
+            e.g. to go through a proxy or a local stub server.
+        max_workers (int): Number of pages requested in parallel
+            when retrieving all_records. Keep at or below pool_maxsize.
+        rate_limit (float): Max calls per second across all namespaces.
+            Set it below your institution's Alma threshold.
+        quota_floor (int): Stop calling the API when this few daily calls
+            are left. The count left is at alma.rate_limiter.remaining.
+        rate_limiter (RateLimiter): Share an existing limiter, e.g. between
+            several connections using the same key. Overrides the above.
+        max_retries (int): Retries of GET calls that fail with a 429, 5xx
+            or a dropped connection, with exponential backoff. 0 disables.
+        retry_policy (RetryPolicy): Full retry settings. Overrides max_retries.
+            SubClients can be given their own, e.g.
+            alma.analytics.reports.retry_policy = RetryPolicy(max_retries=10)
+        cache (Cache): Cache for parsed GET responses, e.g. MemoryCache()
+            or DiskCache(path). By default only configuration endpoints
+            (code tables, libraries, departments, open hours) are cached,
+            and other records are revalidated with conditional GETs.
+            Hit and miss counters are at alma.cache.stats().
+        json_backend (str or callable): Parser of JSON responses. 'auto'
+            picks orjson or ujson when installed, else the json module.
+            'orjson', 'ujson', 'json' or a callable taking bytes force one.
+        metrics (callable or list): Hooks called with a CallEvent after
+            every call: its endpoint, status, sizes, and the time spent
+            waiting, downloading and parsing. E.g. MetricsCollector()
+            for Prometheus, or StatsdSink().
+        cassette (Cassette): Record the calls made to a file, or replay
+            them from it instead of calling the API.
     """
 
-    def __init__(self, apikey, location='America', data_format='json'):
+    # Hook in the various Primo APIs; each is built on first access.
+    search = LazySubClient(SubClientPrimoSearch)
+    analytics = LazySubClient(SubClientAnalytics, is_primo=True)
+
+    def __init__(self, apikey, location='America', data_format='json',
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keep_alive=True, session=None, base_uri=None, max_workers=1,
+                 rate_limit=None, quota_floor=0, rate_limiter=None,
+                 max_retries=3, retry_policy=None, cache=None, json_backend='auto',
+                 metrics=None, cassette=None):
 
         super(PrimoCnxn, self).__init__()
 
@@ -116,21 +240,81 @@ class PrimoCnxn(Client):
                 message = "Valid location arguments are "
                 message += ", ".join(locations.keys())
                 raise utils.ArgError(message=message)
-        self.cnxn_params['location'] = location
-        self.cnxn_params['base_uri'] = locations[location]
+        base_uri = base_uri or locations[location]
 
         # handle preferred format
         if data_format not in ['json', 'xml']:
             message = "Format argument must be either 'json' or 'xml'"
             raise utils.ArgError(message)
-        self.cnxn_params['format'] = data_format
         ns = {'header': 'http://com/exlibris/urm/general/xmlbeans'}
-        self.cnxn_params['xml_ns'] = ns
 
         # TODO: validate api key. return list of accessible endpoints
         # call __validate_key__
-        self.cnxn_params['api_key'] = apikey
 
-        # Hook in the various Primo APIs based on what API key can access
-        self.search = SubClientPrimoSearch(self.cnxn_params)
-        self.analytics = SubClientAnalytics(self.cnxn_params, is_primo=True)
+        # One pooled session is shared by every SubClient of this connection.
+        if session is None:
+            session = build_session(pool_connections, pool_maxsize,
+                                    pool_block, keep_alive)
+        if cassette is not None:
+            cassette.mount(session)
+
+        # One limiter throttles every SubClient of this connection.
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(rate_limit, quota_floor=quota_floor)
+        self.rate_limiter = rate_limiter
+
+        # Transient failures of idempotent calls are retried with backoff.
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retries=max_retries)
+
+        # Responses of slow-changing endpoints may be served from a cache.
+        self.cache = cache
+
+        # Frozen parameters shared, never copied, by every SubClient.
+        # JSON bodies are parsed from bytes by the fastest parser available.
+        self.cnxn_params = CnxnParams(
+            location=location, base_uri=base_uri, format=data_format, xml_ns=ns,
+            api_key=apikey, session=session, max_workers=max_workers,
+            rate_limiter=rate_limiter, retry_policy=retry_policy, cache=cache,
+            json_loads=get_loads(json_backend), metrics=metrics)
+
+
+class AsyncAlmaCnxn(AsyncCnxn):
+    """"Asyncio interface with Alma APIs.
+
+    Exposes the same namespaces as AlmaCnxn, with every method a coroutine.
+
+    E.g.
+    > async with AsyncAlmaCnxn(your_api_key) as alma:
+    >     bibs = await asyncio.gather(*[alma.bibs.catalog.get(mms_id)
+    >                                   for mms_id in mms_ids])
+
+    Args:
+        api_key (str): Your Api Key
+        max_concurrency (int): Max number of requests in flight at once.
+            Also sizes the connection pool.
+        kwargs: Any other AlmaCnxn argument.
+    """
+
+    def __init__(self, apikey, max_concurrency=100, **kwargs):
+        kwargs.setdefault('pool_maxsize', max_concurrency)
+        cnxn = AlmaCnxn(apikey, **kwargs)
+        super(AsyncAlmaCnxn, self).__init__(cnxn, max_concurrency)
+
+
+class AsyncPrimoCnxn(AsyncCnxn):
+    """"Asyncio interface with Primo APIs.
+
+    Exposes the same namespaces as PrimoCnxn, with every method a coroutine.
+
+    Args:
+        api_key (str): Your Api Key
+        max_concurrency (int): Max number of requests in flight at once.
+            Also sizes the connection pool.
+        kwargs: Any other PrimoCnxn argument.
+    """
+
+    def __init__(self, apikey, max_concurrency=100, **kwargs):
+        kwargs.setdefault('pool_maxsize', max_concurrency)
+        cnxn = PrimoCnxn(apikey, **kwargs)
+        super(AsyncPrimoCnxn, self).__init__(cnxn, max_concurrency)
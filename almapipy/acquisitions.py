@@ -1,4 +1,4 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -11,31 +11,27 @@ class SubClientAcquistions(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/acq
     """
 
-    def __init__(self, cnxn_params={}):
+    # Subclients are built on first access.
+    funds = LazySubClient('SubClientAcquistionsFunds')
+    po_lines = LazySubClient('SubClientAcquistionsPO')
+    vendors = LazySubClient('SubClientAcquistionsVendors')
+    invoices = LazySubClient('SubClientAcquistionsInvoices')
+    licenses = LazySubClient('SubClientAcquistionsLicenses')
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/acq"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/acq"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/d5b14609-b590-470e-baba-9944682f8c7e.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+    def __init__(self, cnxn_params={}):
 
-        # Hook in subclients of api
-        self.funds = SubClientAcquistionsFunds(self.cnxn_params)
-        self.po_lines = SubClientAcquistionsPO(self.cnxn_params)
-        self.vendors = SubClientAcquistionsVendors(self.cnxn_params)
-        self.invoices = SubClientAcquistionsInvoices(self.cnxn_params)
-        self.licenses = SubClientAcquistionsLicenses(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/acq",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/acq",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/d5b14609-b590-470e-baba-9944682f8c7e.wadl")
 
 
 class SubClientAcquistionsFunds(Client):
     """Handles the Funds endpoints of Acquisitions API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/funds'
-        self.cnxn_params['api_uri_full'] += '/funds'
+        self.cnxn_params = cnxn_params.child('/funds')
 
     def get(self, limit=10, offset=0, library=None, all_records=False,
             q_params={}, raw=False):
@@ -57,8 +53,8 @@ class SubClientAcquistionsFunds(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
-        url = self.cnxn_params['api_uri_full']
+        args['apikey'] = self.cnxn_params.api_key
+        url = self.cnxn_params.api_uri_full
         args['limit'] = limit
         args['offset'] = int(offset)
 
@@ -73,14 +69,35 @@ class SubClientAcquistionsFunds(Client):
                                          response=response, data_key='fund')
         return response
 
+    def iter(self, library=None, q_params={}):
+        """Iterate over every fund, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            library (str): The code of the library that owns the PO line
+                for which the relevant funds should be retrieved.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Fund records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if library:
+            args['library'] = str(library)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='fund')
+
 
 class SubClientAcquistionsPO(Client):
     """Handles the PO Lines endpoints of Acquisitions API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/po-lines'
-        self.cnxn_params['api_uri_full'] += '/po-lines'
+        self.cnxn_params = cnxn_params.child('/po-lines')
 
     def get(self, po_line_id=None, query={}, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -109,9 +126,9 @@ class SubClientAcquistionsPO(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if po_line_id:
             url += ("/" + str(po_line_id))
         else:
@@ -139,6 +156,29 @@ class SubClientAcquistionsPO(Client):
                                          response=response, data_key='po_line')
         return response
 
+    def iter(self, query={}, q_params={}):
+        """Iterate over every PO-Line matching a query, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            query (dict): Search query for filtering PO-Lines. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            PO-Line records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='po_line')
+
     def get_items(self, po_line_id, q_params={}, raw=False):
         """Retrieve a list items related to a specific PO-line
 
@@ -152,9 +192,9 @@ class SubClientAcquistionsPO(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(po_line_id) + "/items")
 
         response = self.read(url, args, raw=raw)
@@ -165,9 +205,7 @@ class SubClientAcquistionsVendors(Client):
     """Handles the Vendor endpoints of Acquisitions API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/vendors'
-        self.cnxn_params['api_uri_full'] += '/vendors'
+        self.cnxn_params = cnxn_params.child('/vendors')
 
     def get(self, vendor_id=None, status='ALL', type_='ALL',
             query={}, limit=10, offset=0, all_records=False,
@@ -197,9 +235,9 @@ class SubClientAcquistionsVendors(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if vendor_id:
             url += ("/" + str(vendor_id))
         else:
@@ -229,6 +267,33 @@ class SubClientAcquistionsVendors(Client):
                                          response=response, data_key='vendor')
         return response
 
+    def iter(self, status='ALL', type_='ALL', query={}, q_params={}):
+        """Iterate over every vendor matching a query, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            status (str): Vendor Status. Valid values: [active, inactive, ALL].
+            type_ (str): Vendor Type. See get() for valid values.
+            query (dict): Search query for filtering a vendor list. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Vendor records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        args['status'] = str(status)
+        args['type'] = str(type_)
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='vendor')
+
     def get_invoices(self, vendor_id, limit=10, offset=0, all_records=False,
                      q_params={}, raw=False):
         """Retrieve invoices for a specific vendor.
@@ -250,9 +315,9 @@ class SubClientAcquistionsVendors(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += "/" + (str(vendor_id))
         url += "/invoices"
 
@@ -273,6 +338,28 @@ class SubClientAcquistionsVendors(Client):
                                          response=response, data_key='invoice')
         return response
 
+    def iter_invoices(self, vendor_id, q_params={}):
+        """Iterate over every invoice of a vendor, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            vendor_id (str):  A unique identifier for the vendor (vendorCode).
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Invoices for vendor.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += "/" + (str(vendor_id))
+        url += "/invoices"
+
+        yield from self.__iter_all__(url, args, data_key='invoice')
+
     def get_po_lines(self, vendor_id, limit=10, offset=0, all_records=False,
                      q_params={}, raw=False):
         """Retrieve po-lines for a specific vendor.
@@ -294,9 +381,9 @@ class SubClientAcquistionsVendors(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += "/" + (str(vendor_id))
         url += "/po-lines"
 
@@ -317,14 +404,34 @@ class SubClientAcquistionsVendors(Client):
                                          response=response, data_key='po_line')
         return response
 
+    def iter_po_lines(self, vendor_id, q_params={}):
+        """Iterate over every PO-Line of a vendor, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            vendor_id (str):  A unique identifier for the vendor (vendorCode).
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            PO-Lines for vendor.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += "/" + (str(vendor_id))
+        url += "/po-lines"
+
+        yield from self.__iter_all__(url, args, data_key='po_line')
+
 
 class SubClientAcquistionsInvoices(Client):
     """Handles the Invoices endpoints of Acquisitions API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/invoices'
-        self.cnxn_params['api_uri_full'] += '/invoices'
+        self.cnxn_params = cnxn_params.child('/invoices')
 
     def get(self, invoice_id=None, query={}, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -350,9 +457,9 @@ class SubClientAcquistionsInvoices(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if invoice_id:
             url += ("/" + str(invoice_id))
         else:
@@ -380,14 +487,35 @@ class SubClientAcquistionsInvoices(Client):
                                          response=response, data_key='invoice')
         return response
 
+    def iter(self, query={}, q_params={}):
+        """Iterate over every invoice matching a query, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            query (dict): Search query for filtering invoices. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Invoice records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='invoice')
+
 
 class SubClientAcquistionsLicenses(Client):
     """Handles the Licenses endpoints of Acquisitions API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/licenses'
-        self.cnxn_params['api_uri_full'] += '/licenses'
+        self.cnxn_params = cnxn_params.child('/licenses')
 
     def get(self, license_id=None, status='ALL', review_status='ALL',
             query={}, limit=10, offset=0, all_records=False,
@@ -416,9 +544,9 @@ class SubClientAcquistionsLicenses(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if license_id:
             url += ("/" + str(license_id))
         else:
@@ -448,6 +576,33 @@ class SubClientAcquistionsLicenses(Client):
                                          response=response, data_key='license')
         return response
 
+    def iter(self, status='ALL', review_status='ALL', query={}, q_params={}):
+        """Iterate over every license matching a query, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            status (str): Valid values are ACTIVE, DELETED, DRAFT, EXPIRED, RETIRED, ALL
+            review_status (str): ALL, or a value of the LicenseReviewStatuses code table
+            query (dict): Search query for filtering licenses. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            License records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        args['status'] = str(status)
+        args['review_status'] = str(review_status)
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='license')
+
     def get_amendments(self, license_id, amendment_id=None, q_params={}, raw=False):
         """Retrieve a specific license's amendments.
 
@@ -462,9 +617,9 @@ class SubClientAcquistionsLicenses(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(license_id) + "/amendments")
         if amendment_id:
             url += ("/" + str(amendment_id))
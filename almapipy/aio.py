@@ -0,0 +1,90 @@
+"""
+Asyncio access to the Alma and Primo API namespaces.
+"""
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import Client
+
+
+class AsyncSubClient(object):
+    """Mirrors a SubClient, exposing its public methods as coroutines.
+
+    Nested SubClients are wrapped on first access, so the async tree has the
+    same namespaces as the sync one (bibs.catalog, users.loans, ...).
+    Generator methods such as users.iter become async generators.
+    Parameter building, pagination and parsing all run the sync code,
+    on a bounded pool of workers sharing the connection's pooled session.
+    """
+
+    def __init__(self, client, executor):
+        self._client = client
+        self._executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if isinstance(attr, Client):
+            value = AsyncSubClient(attr, self._executor)
+        elif callable(attr) and not name.startswith('_'):
+            value = self.__coroutine__(attr)
+        else:
+            return attr
+
+        # cache so repeated lookups skip the wrapping
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(dir(self._client)) | set(self.__dict__))
+
+    def __coroutine__(self, method):
+        executor = self._executor
+
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            async def iterate(*args, **kwargs):
+                loop = asyncio.get_event_loop()
+                records = method(*args, **kwargs)
+                done = object()
+                while True:
+                    record = await loop.run_in_executor(executor, next, records, done)
+                    if record is done:
+                        break
+                    yield record
+
+            return iterate
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            func = functools.partial(method, *args, **kwargs)
+            return await loop.run_in_executor(executor, func)
+
+        return call
+
+
+class AsyncCnxn(AsyncSubClient):
+    """Base of the async connections.
+
+    Args:
+        cnxn (Client): Sync connection whose namespaces are mirrored.
+        max_concurrency (int): Max number of requests in flight at once.
+    """
+
+    def __init__(self, cnxn, max_concurrency=100):
+        executor = ThreadPoolExecutor(max_workers=int(max_concurrency))
+        super(AsyncCnxn, self).__init__(cnxn, executor)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Waits for in-flight calls, then closes the workers and the session."""
+        self._executor.shutdown(wait=True)
+        self._client.close()
@@ -1,5 +1,8 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
+import datetime
+import json
+import os
 import xml.etree.ElementTree as ET
 
 
@@ -9,35 +12,31 @@ class SubClientAnalytics(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/analytics
     """
 
+    # Subclients are built on first access. Primo has no paths endpoint.
+    paths = LazySubClient('SubClientAnalyticsPaths')
+    reports = LazySubClient('SubClientAnalyticsReports')
+
     def __init__(self, cnxn_params={}, is_primo=False):
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
+        # Derive parameters specific to this API from the connection's.
+        # The report namespace is added to a copy, not the connection's.
         if is_primo:
-            self.cnxn_params['api_uri'] = "/primo/v1/analytics"
-            self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-            self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
-            self.reports = SubClientAnalyticsReports(self.cnxn_params)
+            self.cnxn_params = cnxn_params.api("/primo/v1/analytics")
         else:
-            self.cnxn_params['api_uri'] = "/almaws/v1/analytics"
-            self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/analytics"
-            self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/10788916-19f6-4f19-aaf1-c18fa0c31ccd.wadl"
-            self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-            self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
-            self.cnxn_params['xml_ns']['report'] = 'urn:schemas-microsoft-com:xml-analysis:rowset'
-
-            # Hook in subclients of api
-            self.paths = SubClientAnalyticsPaths(self.cnxn_params)
-            self.reports = SubClientAnalyticsReports(self.cnxn_params)
+            xml_ns = dict(cnxn_params.xml_ns)
+            xml_ns['report'] = 'urn:schemas-microsoft-com:xml-analysis:rowset'
+            self.cnxn_params = cnxn_params.api(
+                "/almaws/v1/analytics",
+                web_doc="https://developers.exlibrisgroup.com/alma/apis/analytics",
+                wadl_url="https://developers.exlibrisgroup.com/resources/wadl/10788916-19f6-4f19-aaf1-c18fa0c31ccd.wadl",
+                xml_ns=xml_ns)
 
 
 class SubClientAnalyticsPaths(Client):
     """Handles the path endpoints of analytics API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/paths'
-        self.cnxn_params['api_uri_full'] += '/paths'
+        self.cnxn_params = cnxn_params.child('/paths')
 
     def get(self, path=None, q_params={}, raw=False):
         """This API lists the contents of the Alma Analytics report directory.
@@ -53,12 +52,12 @@ class SubClientAnalyticsPaths(Client):
             ls of directory specificed by path.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if path:
             url += ("/" + str(path))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -67,9 +66,7 @@ class SubClientAnalyticsReports(Client):
     """Handles the reports endpoints of analytics API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/reports'
-        self.cnxn_params['api_uri_full'] += '/reports'
+        self.cnxn_params = cnxn_params.child('/reports')
 
     def get(self, path, _filter=None, limit=25, col_names=True, return_json=False,
             all_records=False, q_params={}, raw=False):
@@ -96,10 +93,10 @@ class SubClientAnalyticsReports(Client):
             XML ET or json-like structure of report,
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['path'] = path
         args['format'] = 'xml'
         args['limit'] = str(int(limit))
@@ -117,7 +114,7 @@ class SubClientAnalyticsReports(Client):
             if not all_records:
                 return report
             responses = [report]
-            report = ET.fromstring(report.text)
+            report = ET.fromstring(report.content)
 
         get_more = False
         if all_records:
@@ -126,7 +123,7 @@ class SubClientAnalyticsReports(Client):
                 get_more = True
 
                 # just need token and apikey for future calls
-                margs = {'apikey': self.cnxn_params['api_key']}
+                margs = {'apikey': self.cnxn_params.api_key}
                 margs['token'] = report[0].find('ResumptionToken').text
                 margs['format'] = 'xml'
 
@@ -146,7 +143,7 @@ class SubClientAnalyticsReports(Client):
 
                 if raw:
                     responses += [report_more]
-                    report_more = ET.fromstring(report_more.text)
+                    report_more = ET.fromstring(report_more.content)
 
                 else:
                     for tag in [row_tag, 'Row']:
@@ -165,17 +162,7 @@ class SubClientAnalyticsReports(Client):
 
         if return_json:
             # extract column names
-            columns_tag = "{http://www.w3.org/2001/XMLSchema}element"
-            columns = list(report.iter(columns_tag))
-            headers = {}
-            for col in columns:
-                key = col.attrib['name']
-                try:
-                    value = col.attrib['{urn:saw-sql}columnHeading']
-                except Exception:
-                    value = col.attrib['name']
-                value = value.lower().replace(" ", "_")
-                headers[key] = value
+            headers = self.__column_headers__(report)
 
             # find report content in XML report
             for tag in [row_tag, 'Row']:
@@ -197,11 +184,221 @@ class SubClientAnalyticsReports(Client):
                     return []  # this report is empty
 
             # covert to list of dicts
-            dicts = []
-            for row in rows:
-                values = [col.text for col in row]
-                keys = [headers[col.tag.split('}')[-1]] for col in row]
-                dicts.append({key: value for key, value in zip(keys, values)})
-            return dicts
+            return [self.__row_dict__(row, headers) for row in rows]
 
         return report
+
+    def iter_rows(self, path, _filter=None, limit=1000, col_names=True,
+                  checkpoint=None, q_params={}):
+        """Yields the rows of an Alma Analytics report one page at a time.
+            Each page is parsed incrementally as it downloads and rows are
+            yielded as soon as they are complete, so neither the report nor
+            a whole page is ever held in memory.
+
+            If a checkpoint file is given, the ResumptionToken and the number
+            of rows yielded are saved to it after every page. Running the same
+            call again after an interruption resumes from the saved token
+            rather than from the first row. The file is removed once the
+            report is finished. Alma serves each page of a token only once,
+            so rows of a page that was only partly consumed are not repeated.
+
+        Args:
+            path (str): path of report relative to report root.
+                non-URL-encoded. Leave slashes and spaces.
+            _filter (str): An XML representation of a filter in OBI format.
+            limit (int): Rows per call. Between 25 and 1000 (multiples of 25).
+            col_names (bool): Use column headings as dict keys.
+            checkpoint (str): Path of a json file for resuming the pull.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            dict for each row of the report.
+        """
+        columns = {}
+        headers = None
+        for row in self.__iter_report__(path, _filter, limit, col_names,
+                                        checkpoint, q_params, columns):
+            if headers is None:
+                headers = {name: col[0] for name, col in columns.items()}
+            yield self.__row_dict__(row, headers)
+
+    def get_columns(self, path, _filter=None, limit=1000, q_params={}):
+        """Returns a whole report as columns rather than rows.
+            Each column heading maps to a list of values, converted once per
+            column to the type declared in the report's xsd schema:
+            integers to int, decimals and doubles to float, dates and
+            timestamps to datetime objects. Empty cells are None.
+            The result can be handed to pandas.DataFrame(columns) or
+            pyarrow.table(columns) as is.
+
+        Args:
+            path (str): path of report relative to report root.
+                non-URL-encoded. Leave slashes and spaces.
+            _filter (str): An XML representation of a filter in OBI format.
+            limit (int): Rows per call. Between 25 and 1000 (multiples of 25).
+            q_params (dict): Any additional query parameters.
+
+        Returns:
+            dict of column heading -> list of values.
+        """
+        columns = {}
+        values = {}
+        n_rows = 0
+        for row in self.__iter_report__(path, _filter, limit, True,
+                                        None, q_params, columns):
+            for cell in row:
+                column = values.setdefault(cell.tag.split('}')[-1], [])
+                if len(column) < n_rows:
+                    # cells of empty values are left out of the row
+                    column.extend([None] * (n_rows - len(column)))
+                column.append(cell.text)
+            n_rows += 1
+
+        table = {}
+        for name in list(columns) + [n for n in values if n not in columns]:
+            column = values.pop(name, [])
+            column.extend([None] * (n_rows - len(column)))
+            heading, xsd_type = columns.get(name, (name, None))
+            table[heading] = convert_column(column, xsd_type)
+        return table
+
+    def __iter_report__(self, path, _filter, limit, col_names, checkpoint,
+                        q_params, columns):
+        """Yields the Row elements of a report, following ResumptionTokens.
+            See iter_rows for the checkpoint behaviour.
+
+        Args:
+            columns (dict): Filled with column name -> [heading, xsd type]
+                from the report schema before the first row is yielded.
+            Others as in iter_rows.
+
+        Yields:
+            Row xml Elements, cleared once the next one is requested.
+        """
+        url = self.cnxn_params.api_uri_full
+
+        state = None
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                state = json.load(f)
+            if state.get('path') != path or state.get('filter') != _filter:
+                message = "Checkpoint file belongs to another report or filter."
+                raise utils.ArgError(message)
+
+        if state:
+            columns.update(state['columns'])
+            rows = state['rows']
+            args = {'apikey': self.cnxn_params.api_key,
+                    'token': state['token'],
+                    'format': 'xml'}
+        else:
+            rows = 0
+            args = q_params.copy()
+            args['apikey'] = self.cnxn_params.api_key
+            args['path'] = path
+            args['format'] = 'xml'
+            args['limit'] = str(int(limit))
+            args['col_names'] = col_names
+            if _filter:
+                args['filter'] = _filter
+
+        row_tag = "{urn:schemas-microsoft-com:xml-analysis:rowset}Row"
+        columns_tag = "{http://www.w3.org/2001/XMLSchema}element"
+        tags = {row_tag, 'Row', columns_tag, 'ResumptionToken', 'IsFinished'}
+        known_columns = bool(columns)
+
+        while True:
+            finished = True
+            new_token = None
+            for elem in self.__stream_xml__(url, args, tags):
+                if elem.tag == 'ResumptionToken':
+                    new_token = elem.text
+                elif elem.tag == 'IsFinished':
+                    finished = elem.text != 'false'
+                elif elem.tag == columns_tag:
+                    if not known_columns:
+                        heading = self.__column_headers__(elem)[elem.attrib['name']]
+                        columns[elem.attrib['name']] = [heading, elem.attrib.get('type')]
+                else:
+                    known_columns = True
+                    yield elem
+                    rows += 1
+            known_columns = known_columns or bool(columns)
+
+            if new_token:
+                # Alma only sends the token with the first page
+                args = {'apikey': self.cnxn_params.api_key,
+                        'token': new_token,
+                        'format': 'xml'}
+            if checkpoint:
+                if finished:
+                    if os.path.exists(checkpoint):
+                        os.remove(checkpoint)
+                else:
+                    state = {'path': path, 'filter': _filter,
+                             'token': args['token'], 'rows': rows,
+                             'columns': columns}
+                    temp = checkpoint + '.tmp'
+                    with open(temp, 'w') as f:
+                        json.dump(state, f)
+                    os.replace(temp, checkpoint)
+            if finished:
+                break
+
+    def __column_headers__(self, report):
+        """Maps column element names (Column0...) to snake case headings."""
+        columns_tag = "{http://www.w3.org/2001/XMLSchema}element"
+        headers = {}
+        for col in report.iter(columns_tag):
+            key = col.attrib['name']
+            try:
+                value = col.attrib['{urn:saw-sql}columnHeading']
+            except Exception:
+                value = col.attrib['name']
+            value = value.lower().replace(" ", "_")
+            headers[key] = value
+        return headers
+
+    def __row_dict__(self, row, headers):
+        """Converts a Row element to a dict keyed by column heading."""
+        record = {}
+        for col in row:
+            key = col.tag.split('}')[-1]
+            record[headers.get(key, key)] = col.text
+        return record
+
+
+def _to_date(text):
+    return datetime.date(*map(int, text[:10].split('-')))
+
+
+def _to_datetime(text):
+    return datetime.datetime.strptime(text[:19], '%Y-%m-%dT%H:%M:%S')
+
+
+# Converters for the xsd types used in Analytics report schemas.
+XSD_CONVERTERS = {'int': int, 'integer': int, 'long': int, 'short': int,
+                  'decimal': float, 'double': float, 'float': float,
+                  'date': _to_date, 'dateTime': _to_datetime,
+                  'boolean': lambda text: text.lower() == 'true'}
+
+
+def convert_column(values, xsd_type):
+    """Converts a column of text values to the python type of its xsd type.
+        The column is left as text if the type is unknown or a value
+        does not parse.
+
+    Args:
+        values (list): Column values as str, or None for empty cells.
+        xsd_type (str): Type from the report schema, e.g. 'xsd:int'.
+
+    Returns:
+        list of converted values.
+    """
+    convert = XSD_CONVERTERS.get(str(xsd_type).split(':')[-1])
+    if convert is None:
+        return values
+    try:
+        return [None if value is None else convert(value) for value in values]
+    except ValueError:
+        return values
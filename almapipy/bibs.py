@@ -1,4 +1,9 @@
-from .client import Client
+import threading
+
+import requests
+
+from .client import Client, LazySubClient
+from . import bulk
 from . import utils
 
 
@@ -8,23 +13,21 @@ class SubClientBibs(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/bibs
     """
 
-    def __init__(self, cnxn_params={}):
+    # Subclients are built on first access.
+    catalog = LazySubClient('SubClientBibsCatalog')
+    collections = LazySubClient('SubClientBibsCollections')
+    loans = LazySubClient('SubClientBibsLoans')
+    requests = LazySubClient('SubClientBibsRequests')
+    representations = LazySubClient('SubClientBibsRepresentations')
+    linked_data = LazySubClient('SubClientBibsLinkedData')
 
-        # Copy cnnection parameters and add info specific to Bibs.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/bibs"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/bibs"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/af2fb69d-64f4-42bc-bb05-d8a0ae56936e.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+    def __init__(self, cnxn_params={}):
 
-        # Hook in subclients of bib
-        self.catalog = SubClientBibsCatalog(self.cnxn_params)
-        self.collections = SubClientBibsCollections(self.cnxn_params)
-        self.loans = SubClientBibsLoans(self.cnxn_params)
-        self.requests = SubClientBibsRequests(self.cnxn_params)
-        self.representations = SubClientBibsRepresentations(self.cnxn_params)
-        self.linked_data = SubClientBibsLinkedData(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/bibs",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/bibs",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/af2fb69d-64f4-42bc-bb05-d8a0ae56936e.wadl")
 
 
 class SubClientBibsCatalog(Client):
@@ -51,7 +54,7 @@ class SubClientBibsCatalog(Client):
             https://developers.exlibrisgroup.com/alma/apis/xsd/rest_bibs.xsd?tags=GET
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         # validate arguments
         if type(bib_ids) != list and type(bib_ids) != str:
@@ -60,7 +63,7 @@ class SubClientBibsCatalog(Client):
 
         # format arguments
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         # determine which endpoint to call.
         if type(bib_ids) == str:
@@ -73,6 +76,102 @@ class SubClientBibsCatalog(Client):
 
         return self.read(url, args, raw=raw)
 
+    def iter_many(self, bib_ids, expand=None, max_workers=None, q_params={}):
+        """Retrieves any number of Bib records, 100 per call, several calls at once.
+            IDs are deduplicated and read lazily, so bib_ids may be a
+            generator over millions of IDs.
+
+        Args:
+            bib_ids (iterable): Bib Record IDs (mms_id).
+            expand (str): provides additional information. See get().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            (mms_id, record) tuples, in the order of bib_ids.
+                record is None if Alma returned no bib for the ID.
+
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def read_chunk(chunk):
+            try:
+                response = self.get(chunk, expand=expand, q_params=q_params)
+            except utils.AlmaError as e:
+                # Alma rejects a batch made up only of unknown/invalid IDs
+                if e.response != 400:
+                    raise
+                return [(mms_id, None) for mms_id in chunk]
+
+            found = {}
+            if type(response) == dict:
+                for bib in response.get('bib', []):
+                    found[str(bib.get('mms_id'))] = bib
+            else:
+                for bib in response.findall('bib'):
+                    found[bib.findtext('mms_id')] = bib
+            return [(mms_id, found.get(mms_id)) for mms_id in chunk]
+
+        bib_ids = utils.unique(str(mms_id) for mms_id in bib_ids)
+        chunks = utils.chunked(bib_ids, 100)
+        for results in utils.imap_bounded(read_chunk, chunks, max_workers):
+            for result in results:
+                yield result
+
+    def get_many(self, bib_ids, expand=None, max_workers=None, q_params={}):
+        """Retrieves any number of Bib records. See iter_many.
+
+        Args:
+            bib_ids (iterable): Bib Record IDs (mms_id).
+            expand (str): provides additional information. See get().
+            max_workers (int): Number of calls made at once.
+            q_params (dict): Any additional query parameters.
+
+        Returns:
+            (records, missing): dict of mms_id -> bib record,
+                and list of the IDs Alma returned no bib for.
+
+        """
+        records = {}
+        missing = []
+        for mms_id, record in self.iter_many(bib_ids, expand=expand,
+                                             max_workers=max_workers,
+                                             q_params=q_params):
+            if record is None:
+                missing.append(mms_id)
+            else:
+                records[mms_id] = record
+        return records, missing
+
+    def iter_records(self, bib_ids, expand=None, q_params={}):
+        """Yields Bib records as MARC XML while the response downloads.
+            The body is parsed incrementally, so a batch of 100 bibs is
+            never held in memory at once, neither as text nor as a tree.
+
+        Args:
+            bib_ids (list): list of bib Record IDs. len = 1-100.
+            expand (str): provides additional information. See get().
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            bib xml Elements. Each is cleared once the next one is requested.
+
+        """
+        url = self.cnxn_params.api_uri_full
+
+        if type(bib_ids) == str:
+            bib_ids = [bib_ids]
+
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        args['mms_id'] = ",".join(bib_ids)
+        if expand:
+            args['expand'] = expand
+
+        yield from self.__stream_xml__(url, args, {'bib'})
+
     def get_holdings(self, bib_id, holding_id=None, q_params={}, raw=False):
         """Returns list of holding records or single holding record
             for a given bib record ID.
@@ -93,14 +192,14 @@ class SubClientBibsCatalog(Client):
             List of holding records or single holding record
                 for a given bib record ID.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += '/holdings'
         if holding_id:
             url += ('/' + str(holding_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -120,17 +219,87 @@ class SubClientBibsCatalog(Client):
             List of holding record items or a single item
                 for a given bib record ID.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/holdings/' + str(holding_id)) + '/items'
         if item_id:
             url += ('/' + str(item_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
+    def get_inventory_tree(self, bib_ids, max_workers=None):
+        """Crawls the physical inventory of bibs: their holdings, and the
+            items of each holding, several bibs at once.
+            Results are yielded as each bib is done, so bib_ids may be a
+            generator over any number of IDs.
+            A failed call is reported in the 'error' field of its level and
+            does not stop the crawl. A holding listed under several bibs
+            has its items read once; its other listings are flagged 'duplicate'.
+
+        Args:
+            bib_ids (iterable): Bib Record IDs (mms_id).
+            max_workers (int): Number of bibs crawled at once.
+                Defaults to the connection's max_workers setting.
+
+        Yields:
+            dict per bib, in the order of bib_ids:
+                {'mms_id': str, 'bib': bib_data or None, 'error': str or None,
+                 'holdings': [{'holding_id': str, 'holding': dict,
+                               'items': list or None, 'duplicate': bool,
+                               'error': str or None}]}
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        seen = set()
+        seen_lock = threading.Lock()
+
+        def crawl(mms_id):
+            tree = {'mms_id': mms_id, 'bib': None, 'holdings': [], 'error': None}
+            try:
+                response = self.get_holdings(mms_id, q_params={'format': 'json'})
+            except (utils.AlmaError, requests.exceptions.RequestException) as e:
+                tree['error'] = str(e)
+                return tree
+            tree['bib'] = response.get('bib_data')
+
+            for holding in response.get('holding', []):
+                holding_id = str(holding.get('holding_id'))
+                node = {'holding_id': holding_id, 'holding': holding,
+                        'items': None, 'duplicate': False, 'error': None}
+                tree['holdings'].append(node)
+                with seen_lock:
+                    node['duplicate'] = holding_id in seen
+                    seen.add(holding_id)
+                if node['duplicate']:
+                    continue
+                try:
+                    node['items'] = self.__read_holding_items__(mms_id, holding_id)
+                except (utils.AlmaError, requests.exceptions.RequestException) as e:
+                    node['error'] = str(e)
+            return tree
+
+        bib_ids = utils.unique(str(mms_id) for mms_id in bib_ids)
+        for tree in utils.imap_bounded(crawl, bib_ids, max_workers):
+            yield tree
+
+    def __read_holding_items__(self, bib_id, holding_id):
+        """Returns every item of a holding as a list of dicts."""
+        url = self.cnxn_params.api_uri_full
+        url += ("/" + str(bib_id))
+        url += ('/holdings/' + str(holding_id)) + '/items'
+
+        args = {'apikey': self.cnxn_params.api_key, 'format': 'json',
+                'limit': 100, 'offset': 0}
+        response = self.read(url, args)
+        response = self.__read_all__(url=url, args=args, raw=False,
+                                     response=response, data_key='item',
+                                     max_workers=1)
+        return response.get('item', [])
+
     def get_portfolios(self, bib_id, portfolio_id=None, q_params={}, raw=False):
         """Returns a list or single portfolio for a Bib.
 
@@ -149,14 +318,14 @@ class SubClientBibsCatalog(Client):
         Returns:
             Returns a list or single portfolio for a Bib.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += '/portfolios'
         if portfolio_id:
             url += ('/' + str(portfolio_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -179,11 +348,11 @@ class SubClientBibsCatalog(Client):
             Bib object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         object_type = 'bib'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['format'] = 'xml'
 
         if from_nz_mms_id:
@@ -211,13 +380,13 @@ class SubClientBibsCatalog(Client):
             Holding object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += '/holdings'
         object_type = 'holding'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['format'] = 'xml'
 
         response = self.create(url, data, args, object_type, raw=raw)
@@ -240,27 +409,98 @@ class SubClientBibsCatalog(Client):
             Item object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += '/holdings/'
         url += (str(holding_id) + "/items")
         object_type = 'item'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         response = self.create(url, data, args, object_type, raw=raw)
 
         return response
 
+    def bulk_post(self, records, max_workers=None, rate_limit=None, journal=None,
+                  q_params={}):
+        """Creates many Bib records, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): Bib objects (xml/str). See post().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new mms_id.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data):
+            return self.post(data, q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'mms_id', max_workers, rate_limit,
+                                    journal, 'bibs.catalog.post')
+
+    def bulk_post_holding(self, records, max_workers=None, rate_limit=None,
+                          journal=None, q_params={}):
+        """Creates many holding records, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): (data, bib_id) tuples. See post_holding().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new holding_id.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data, bib_id):
+            return self.post_holding(data, bib_id, q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'holding_id', max_workers, rate_limit,
+                                    journal, 'bibs.catalog.post_holding')
+
+    def bulk_post_holding_item(self, records, max_workers=None, rate_limit=None,
+                               journal=None, q_params={}):
+        """Creates many items, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): (data, bib_id, holding_id) tuples.
+                See post_holding_item().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new item pid.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data, bib_id, holding_id):
+            return self.post_holding_item(data, bib_id, holding_id, q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'item_data/pid', max_workers, rate_limit,
+                                    journal, 'bibs.catalog.post_holding_item')
+
 
 class SubClientBibsCollections(Client):
     """Handles collections"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/collections'
-        self.cnxn_params['api_uri_full'] += '/collections'
+        self.cnxn_params = cnxn_params.child('/collections')
 
     def get(self, pid=None, query={}, q_params={}, raw=False):
         """Returns meta data about collections in libraries.
@@ -279,12 +519,12 @@ class SubClientBibsCollections(Client):
             A list of collections or a collection for a given pid.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if pid:
             url += ("/" + str(pid))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         if query:
             args['q'] = self.__format_query__(query)
@@ -304,12 +544,12 @@ class SubClientBibsCollections(Client):
             A a list of bibliographic titles in a given collection.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(pid))
         url += '/bibs'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -327,11 +567,11 @@ class SubClientBibsCollections(Client):
             Collection object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         object_type = 'collection'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['record_format'] = record_format
 
         response = self.create(url, data, args, object_type, raw=raw)
@@ -351,14 +591,14 @@ class SubClientBibsCollections(Client):
             Bib objected added to collection.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(pid))
         url += '/bibs'
 
         object_type = 'bib'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         response = self.create(url, data, args, object_type, raw=raw)
 
@@ -369,7 +609,7 @@ class SubClientBibsLoans(Client):
     """Accesses loans endpoints"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get_by_item(self, bib_id, holding_id, item_id,
                     loan_id=None, q_params={}, raw=False):
@@ -386,7 +626,7 @@ class SubClientBibsLoans(Client):
         Returns:
             List of loans or a single loan for a given item.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/holdings/' + str(holding_id))
         url += ('/items/' + str(item_id) + "/loans")
@@ -394,7 +634,7 @@ class SubClientBibsLoans(Client):
             url += ('/' + str(loan_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -410,13 +650,13 @@ class SubClientBibsLoans(Client):
         Returns:
             List of loans or a single loan for a given title.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id) + '/loans')
         if loan_id:
             url += ('/' + str(loan_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -437,7 +677,7 @@ class SubClientBibsLoans(Client):
             Loan object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/holdings/' + str(holding_id))
         url += ('/items/' + str(item_id) + "/loans")
@@ -445,19 +685,44 @@ class SubClientBibsLoans(Client):
         object_type = 'item_loan'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['user_id'] = str(user_id)
 
         response = self.create(url, data, args, object_type, raw=raw)
 
         return response
 
+    def bulk_post(self, records, max_workers=None, rate_limit=None, journal=None,
+                  q_params={}):
+        """Creates many loans, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): (data, bib_id, holding_id, item_id, user_id)
+                tuples. See post().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new loan_id.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data, bib_id, holding_id, item_id, user_id):
+            return self.post(data, bib_id, holding_id, item_id, user_id, q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'loan_id', max_workers, rate_limit,
+                                    journal, 'bibs.loans.post')
+
 
 class SubClientBibsRequests(Client):
     """Accesses user request endpoints"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get_by_item(self, bib_id, holding_id, item_id,
                     request_id=None, q_params={}, raw=False):
@@ -474,7 +739,7 @@ class SubClientBibsRequests(Client):
         Returns:
             List of loans or a single loan for a given item.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/holdings/' + str(holding_id))
         url += ('/items/' + str(item_id) + "/requests")
@@ -482,7 +747,7 @@ class SubClientBibsRequests(Client):
             url += ('/' + str(request_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -498,13 +763,13 @@ class SubClientBibsRequests(Client):
         Returns:
             List of loans or a single loan for a given title.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id) + '/requests')
         if request_id:
             url += ('/' + str(request_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -529,7 +794,7 @@ class SubClientBibsRequests(Client):
         Returns:
             List of periods title/item is unavailable for booking.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         if holding_id and item_id:
             url += ("/holdings/" + str(holding_id))
@@ -541,7 +806,7 @@ class SubClientBibsRequests(Client):
         url += "/booking-availability"
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['period'] = str(period)
         args['period_type'] = str(period_type)
 
@@ -567,7 +832,7 @@ class SubClientBibsRequests(Client):
         Returns:
             Request options for a specific title or item based on user.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         if holding_id and item_id:
             url += ("/holdings/" + str(holding_id))
@@ -579,7 +844,7 @@ class SubClientBibsRequests(Client):
         url += "/request-options"
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['user_id'] = str(user_id)
 
         return self.read(url, args, raw=raw)
@@ -600,14 +865,14 @@ class SubClientBibsRequests(Client):
             Loan object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/requests')
 
         object_type = 'user_request'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         if user_id:
             args['user_id'] = str(user_id)
@@ -635,7 +900,7 @@ class SubClientBibsRequests(Client):
             Loan object created.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/holdings/' + holding_id)
         url += ('/items/' + item_id + "/requests")
@@ -643,7 +908,7 @@ class SubClientBibsRequests(Client):
         object_type = 'user_request'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         if user_id:
             args['user_id'] = str(user_id)
@@ -652,12 +917,62 @@ class SubClientBibsRequests(Client):
 
         return response
 
+    def bulk_post_for_title(self, records, max_workers=None, rate_limit=None,
+                            journal=None, q_params={}):
+        """Creates many title requests, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): (data, bib_id, user_id) tuples. See post_for_title().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new request_id.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data, bib_id, user_id=None):
+            return self.post_for_title(data, bib_id, user_id, q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'request_id', max_workers, rate_limit,
+                                    journal, 'bibs.requests.post_for_title')
+
+    def bulk_post_for_item(self, records, max_workers=None, rate_limit=None,
+                           journal=None, q_params={}):
+        """Creates many item requests, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): (data, bib_id, holding_id, item_id, user_id)
+                tuples. See post_for_item().
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new request_id.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data, bib_id, holding_id, item_id, user_id=None):
+            return self.post_for_item(data, bib_id, holding_id, item_id, user_id,
+                                      q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'request_id', max_workers, rate_limit,
+                                    journal, 'bibs.requests.post_for_item')
+
 
 class SubClientBibsRepresentations(Client):
     """Handles Digital Representations"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get(self, bib_id, q_params={}, raw=False):
         """Returns a list of Digital Representations for a given Bib MMS-ID.
@@ -671,12 +986,12 @@ class SubClientBibsRepresentations(Client):
             A list of Digital Representations for a given bib record.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += "/representations"
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -695,7 +1010,7 @@ class SubClientBibsRepresentations(Client):
             A list of Digital Representations for a given bib record.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += "/representations/"
         url += rep_id
@@ -703,7 +1018,7 @@ class SubClientBibsRepresentations(Client):
             url += "/files"
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -721,19 +1036,44 @@ class SubClientBibsRepresentations(Client):
             Representation object.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id) + '/representations/')
 
         object_type = 'representation'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['generate_label'] = generate_label
 
         response = self.create(url, data, args, object_type, raw=raw)
 
         return response
 
+    def bulk_post(self, records, generate_label=False, max_workers=None,
+                  rate_limit=None, journal=None, q_params={}):
+        """Creates many representations, several calls at once. See bulk.bulk_create.
+
+        Args:
+            records (iterable): (data, bib_id) tuples. See post().
+            generate_label (bool): Auto-generate labels: true/false
+            max_workers (int): Number of calls made at once.
+                Defaults to the connection's max_workers setting.
+            rate_limit (float): Max calls per second for this load.
+            journal (Journal): Journal making the load resumable.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            BulkResult per record, created_id being the new representation id.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+
+        def post(data, bib_id):
+            return self.post(data, bib_id, generate_label, q_params=q_params)
+
+        yield from bulk.bulk_create(post, records, 'id', max_workers, rate_limit,
+                                    journal, 'bibs.representations.post')
+
     def post_file(self, data, bib_id, rep_id, q_params={}, raw=False):
         """Creates a file for a digital representation.
 
@@ -749,14 +1089,14 @@ class SubClientBibsRepresentations(Client):
             Representation object.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(bib_id))
         url += ('/representations/' + str(rep_id) + "/files")
 
         object_type = 'representation'
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         response = self.create(url, data, args, object_type, raw=raw)
 
@@ -767,7 +1107,7 @@ class SubClientBibsLinkedData(Client):
     """Handles Linked Data for a Bib Record"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get(self, bib_id, q_params={}, raw=False):
         """Returns Linked data for a given Bib MMS-ID.
@@ -781,11 +1121,11 @@ class SubClientBibsLinkedData(Client):
             Linked data URIs for a given bib record.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += "/linked-open-data"
         url += ("/" + str(bib_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
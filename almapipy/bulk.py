@@ -0,0 +1,115 @@
+"""
+Creating many records with concurrent POST calls
+"""
+
+import collections
+import xml.etree.ElementTree as ET
+
+import requests
+
+from .journal import DONE, FAILED, PENDING, record_key
+from .ratelimit import RateLimiter
+from . import utils
+
+
+# Outcome of one record of a bulk load.
+#   index: position of the record in the input.
+#   parents: the IDs the record was posted under, e.g. (bib_id, holding_id).
+#   created_id: ID of the created record, None if it failed.
+#   created: the created record as returned by Alma.
+#   error: message of the failure, None if it succeeded.
+#   resumed: True if the record was skipped, being done in the journal.
+BulkResult = collections.namedtuple(
+    'BulkResult', ['index', 'parents', 'created_id', 'created', 'error', 'resumed'])
+
+
+def created_id(record, id_path):
+    """Reads the ID of a created record.
+
+    Args:
+        record (dict or xml Element): Record returned by a post call.
+        id_path (str): Path of the ID in the record, e.g. 'item_data/pid'.
+
+    Returns:
+        str, or None if absent.
+    """
+    if type(record) == ET.Element:
+        return record.findtext(id_path)
+    for key in id_path.split('/'):
+        if type(record) != dict:
+            return None
+        record = record.get(key)
+    return None if record is None else str(record)
+
+
+def bulk_create(post, records, id_path, max_workers=1, rate_limit=None,
+                journal=None, operation=None):
+    """Posts many records with a few calls in flight at once.
+
+    Records are read lazily and results are yielded in input order as the
+    calls complete, so a load of any size runs in constant memory.
+    A failed record does not stop the load. Running out of daily quota does.
+
+    With a journal, each record is journaled before and after it is posted.
+    Re-running the load with the same journal skips the records already
+    created, and posts again those that failed or were in flight.
+
+    Args:
+        post (callable): Post method creating one record,
+            e.g. alma.bibs.catalog.post_holding.
+        records (iterable): Tuples of the positional arguments of post,
+            e.g. (data, bib_id) for post_holding.
+            A lone payload may be given instead of a 1-tuple.
+        id_path (str): Path of the new record's ID in the post response,
+            e.g. 'mms_id' or 'item_data/pid'.
+        max_workers (int): Number of calls made at once.
+        rate_limit (float): Max calls per second for this load, on top of
+            the connection's own limit.
+        journal (Journal): Journal to record progress in and resume from.
+        operation (str): Name of the post call, part of the journal keys,
+            e.g. 'bibs.catalog.post_holding'. Required with a journal.
+
+    Yields:
+        BulkResult per record.
+    """
+    if journal is not None and not operation:
+        raise utils.ArgError("A journaled bulk load needs an operation name.")
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    def create(task):
+        index, args, key = task
+        parents = tuple(args[1:])
+        if key is not None:
+            if journal.done(key):
+                entry = journal.get(key)
+                return BulkResult(index, parents, entry['created_id'], None, None, True)
+            journal.write(key, PENDING)
+
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            record = post(*args)
+        except (utils.AlmaError, requests.exceptions.RequestException) as e:
+            if key is not None:
+                journal.write(key, FAILED, error=str(e))
+            return BulkResult(index, parents, None, None, str(e), False)
+
+        new_id = created_id(record, id_path)
+        if key is not None:
+            journal.write(key, DONE, created_id=new_id)
+        return BulkResult(index, parents, new_id, record, None, False)
+
+    def tasks():
+        seen = collections.Counter()
+        for index, args in enumerate(records):
+            if type(args) != tuple:
+                args = (args,)
+            key = None
+            if journal is not None:
+                digest = record_key(operation, args)
+                key = "{}:{}".format(digest, seen[digest])
+                seen[digest] += 1
+            yield index, args, key
+
+    for result in utils.imap_bounded(create, tasks(), max_workers):
+        yield result
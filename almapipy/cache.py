@@ -0,0 +1,288 @@
+"""
+Caching of parsed API responses for slow-changing endpoints
+"""
+
+import collections
+import pickle
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from . import utils
+
+
+class CacheEntry(object):
+    """A cached response: the pickled parsed content and its validators.
+
+    Args:
+        data (bytes): Pickled parsed content.
+        expires (float): time.time() after which the entry is stale.
+        etag (str): ETag header of the response, if any.
+        last_modified (str): Last-Modified header of the response, if any.
+    """
+
+    __slots__ = ('data', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, data, expires, etag=None, last_modified=None):
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def value(self):
+        """A fresh copy of the parsed content."""
+        return pickle.loads(self.data)
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires
+
+    @property
+    def validated(self):
+        """Whether the entry can be revalidated with a conditional GET."""
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self):
+        """Headers asking the server to answer 304 if nothing changed."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class Cache(object):
+    """Base class of the response caches used by Client.read.
+
+    Decides which endpoints are cached and for how long, builds cache keys
+    and counts hits and misses. Subclasses store the entries.
+    Values are stored pickled, so callers always get their own copy.
+
+    Responses carrying an ETag or Last-Modified header are kept once stale,
+    and their url requested again with If-None-Match / If-Modified-Since.
+    A 304 answer then reuses the cached content without downloading or
+    parsing the body.
+
+    Args:
+        ttls (dict): Seconds to cache responses for, keyed by url path
+            fragment. The fragment found furthest into a url wins, so
+            '/open-hours' beats '/conf/libraries' for a library's hours.
+            Defaults to DEFAULT_TTLS.
+        default_ttl (float): Seconds for urls matching no fragment.
+            0 means they are not cached.
+        revalidate (bool or tuple): Keep responses with validators for
+            conditional requests, for every url if True, or for urls
+            containing one of the given path fragments, e.g. ('/bibs/',).
+    """
+
+    # Configuration that changes maybe once a day.
+    DEFAULT_TTLS = {'/conf/code-tables/': 86400,
+                    '/conf/libraries': 86400,
+                    '/conf/departments': 86400,
+                    '/conf/general': 86400,
+                    '/open-hours': 3600}
+
+    def __init__(self, ttls=None, default_ttl=0, revalidate=True):
+        if ttls is None:
+            ttls = self.DEFAULT_TTLS
+        self.ttls = dict(ttls)
+        self.default_ttl = float(default_ttl)
+        self.revalidate = revalidate
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._stats_lock = threading.Lock()
+
+    def ttl_for(self, url):
+        """Returns seconds a response of url may be cached, 0 if not at all."""
+        path = urlsplit(url).path
+        ttl, end = self.default_ttl, -1
+        for fragment, fragment_ttl in self.ttls.items():
+            found = path.rfind(fragment)
+            if found >= 0 and found + len(fragment) > end:
+                ttl, end = fragment_ttl, found + len(fragment)
+        return ttl
+
+    def revalidates(self, url):
+        """Whether responses of url are kept for conditional requests."""
+        if self.revalidate is True or not self.revalidate:
+            return bool(self.revalidate)
+        path = urlsplit(url).path
+        return any(fragment in path for fragment in self.revalidate)
+
+    def key(self, url, args):
+        """Builds the cache key of a call. The api key is left out so that
+        connections using different keys share entries."""
+        params = sorted((k, str(v)) for k, v in args.items() if k != 'apikey')
+        return url + '?' + urlencode(params)
+
+    def lookup(self, key):
+        """Returns the CacheEntry of key, fresh or stale, or None.
+        Counts a hit if the entry is fresh, a miss otherwise."""
+        entry = self._load(key)
+        fresh = entry is not None and entry.fresh
+        with self._stats_lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+
+    def get(self, key):
+        """Returns the cached value of key, or None if missing or expired."""
+        entry = self.lookup(key)
+        if entry is None or not entry.fresh:
+            return None
+        return entry.value
+
+    def set(self, key, value, ttl, etag=None, last_modified=None):
+        """Caches value under key for ttl seconds."""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._store(key, CacheEntry(data, time.time() + ttl, etag, last_modified))
+
+    def store(self, key, value, ttl, response):
+        """Caches the parsed content of a response, with its validators.
+        Skipped if the response may neither be cached nor revalidated."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        self.set(key, value, ttl, etag, last_modified)
+
+    def renew(self, key, entry, ttl, response):
+        """Marks a stale entry fresh again after the server answered 304.
+
+        Returns:
+            A copy of the cached content.
+        """
+        # a new entry, as other threads may be reading the stale one
+        entry = CacheEntry(entry.data, time.time() + ttl,
+                           response.headers.get('ETag', entry.etag),
+                           response.headers.get('Last-Modified', entry.last_modified))
+        self._store(key, entry)
+        with self._stats_lock:
+            self.revalidated += 1
+        return entry.value
+
+    def stats(self):
+        """Returns hit, miss and 304 counters."""
+        with self._stats_lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'revalidated': self.revalidated}
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _load(self, key):
+        raise NotImplementedError
+
+    def _store(self, key, entry):
+        raise NotImplementedError
+
+
+class MemoryCache(Cache):
+    """In-memory cache evicting the least recently used entries.
+
+    Args:
+        maxsize (int): Max number of entries.
+        ttls, default_ttl, revalidate: See Cache.
+    """
+
+    def __init__(self, maxsize=1024, ttls=None, default_ttl=0, revalidate=True):
+        super(MemoryCache, self).__init__(ttls, default_ttl, revalidate)
+        if int(maxsize) < 1:
+            raise utils.ArgError("Cache maxsize must be at least 1.")
+        self.maxsize = int(maxsize)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.fresh and not entry.validated:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class DiskCache(Cache):
+    """Cache kept in a SQLite file, shared between runs and processes.
+
+    Args:
+        path (str): Path of the SQLite file. Created if missing.
+        ttls, default_ttl, revalidate: See Cache.
+    """
+
+    def __init__(self, path, ttls=None, default_ttl=0, revalidate=True):
+        super(DiskCache, self).__init__(ttls, default_ttl, revalidate)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses "
+                             "(key TEXT PRIMARY KEY, data BLOB, expires REAL, "
+                             "etag TEXT, last_modified TEXT)")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def purge(self, max_age=None):
+        """Deletes expired entries from the file.
+
+        Args:
+            max_age (float): Also delete entries kept for revalidation
+                that went stale more than this many seconds ago.
+        """
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE expires <= ? "
+                             "AND etag IS NULL AND last_modified IS NULL", (now,))
+            if max_age is not None:
+                self._db.execute("DELETE FROM responses WHERE expires <= ?",
+                                 (now - max_age,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _load(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT data, expires, etag, last_modified "
+                                   "FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        if not entry.fresh and not entry.validated:
+            return None
+        return entry
+
+    def _store(self, key, entry):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                             (key, entry.data, entry.expires, entry.etag,
+                              entry.last_modified))
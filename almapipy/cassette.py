@@ -0,0 +1,251 @@
+"""
+Recording API calls to a file and replaying them without the network
+"""
+
+import base64
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from . import utils
+
+
+RECORD = 'record'
+REPLAY = 'replay'
+AUTO = 'auto'
+
+REDACTED = 'REDACTED'
+# Shorter api keys, e.g. placeholders used against a stub, are not redacted:
+# replacing them would garble the bodies recorded.
+MIN_REDACTED_LENGTH = 16
+
+# Response headers not worth keeping: they differ on every call.
+SKIPPED_HEADERS = ('set-cookie', 'date', 'x-request-id')
+
+
+class Cassette(object):
+    """File of recorded request/response pairs, served back in place of
+    the API. Lets parsing and pagination be measured and tested on
+    real-shaped data without a live tenant or any API quota.
+
+    Calls are matched on method, url, query string and body. The api key
+    is left out of the match and redacted from everything recorded, so
+    cassettes can be committed. A call made several times is replayed in
+    the order it was recorded, starting over once all were served,
+    so a benchmark can replay the same calls round after round.
+
+    E.g.
+    > with AlmaCnxn(your_api_key, cassette=Cassette('users.jsonl.gz', 'record')) as alma:
+    >     alma.users.get(limit=100, all_records=True)
+    > alma = AlmaCnxn('any_key', cassette=Cassette('users.jsonl.gz', 'replay'))
+
+    Args:
+        path (str): Path of the cassette. Gzipped if it ends with .gz.
+        mode (str): 'record' calls the API and rewrites the cassette,
+            'replay' only serves recorded calls, 'auto' replays if the
+            cassette exists and records it otherwise.
+        latency (bool): When replaying, wait as long as the recorded call
+            took, body included. Otherwise answer at once.
+    """
+
+    def __init__(self, path, mode=AUTO, latency=False):
+        if mode not in (RECORD, REPLAY, AUTO):
+            raise utils.ArgError("Cassette mode must be 'record', 'replay' or 'auto'.")
+        if mode == AUTO:
+            mode = REPLAY if os.path.exists(path) else RECORD
+        if mode == REPLAY and not os.path.exists(path):
+            raise utils.ArgError("No cassette to replay at " + str(path))
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.entries = {}  # key -> list of recorded responses
+        self.served = {}  # key -> number of times served
+        self._file = None
+        self._lock = threading.Lock()
+        if mode == REPLAY:
+            self.load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return sum(len(responses) for responses in self.entries.values())
+
+    def open(self, mode):
+        if self.path.endswith('.gz'):
+            return gzip.open(self.path, mode + 't', encoding='utf-8')
+        return open(self.path, mode, encoding='utf-8')
+
+    def load(self):
+        with self.open('r') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries.setdefault(entry['key'], []).append(entry)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def mount(self, session):
+        """Routes the calls of a requests Session through the cassette.
+
+        Args:
+            session (requests.Session): e.g. alma.cnxn_params.session.
+        """
+        if self.mode == RECORD:
+            adapter = RecordingAdapter(self, session.get_adapter('https://'))
+        else:
+            adapter = ReplayAdapter(self)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    def key(self, method, url, body=None):
+        """Builds the key matching a call: method, url without the api key,
+        sorted query parameters, and a digest of the body if any."""
+        parts = urlsplit(url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if k != 'apikey')
+        key = method.upper() + ' ' + urlunsplit(('', '', parts.path, urlencode(query), ''))
+        if body:
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            key += ' ' + hashlib.sha1(body).hexdigest()[:16]
+        return key
+
+    def record(self, request, response, body, duration):
+        """Appends a call to the cassette.
+
+        Args:
+            request (requests.PreparedRequest): Request sent.
+            response (requests.Response): Response received.
+            body (bytes): Body of the response.
+            duration (float): Seconds the call took, body included.
+        """
+        api_key = dict(parse_qsl(urlsplit(request.url).query)).get('apikey')
+        if api_key and len(api_key) < MIN_REDACTED_LENGTH:
+            api_key = None
+        if api_key:
+            body = body.replace(api_key.encode('utf-8'), REDACTED.encode('utf-8'))
+        try:
+            text, encoding = body.decode('utf-8'), None
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(body).decode('ascii'), 'base64'
+
+        headers = {}
+        for name, value in response.headers.items():
+            if name.lower() not in SKIPPED_HEADERS:
+                headers[name] = value.replace(api_key, REDACTED) if api_key else value
+        entry = {'key': self.key(request.method, request.url, request.body),
+                 'status': response.status_code, 'reason': response.reason,
+                 'headers': headers, 'body': text, 'encoding': encoding,
+                 'elapsed': response.elapsed.total_seconds(), 'duration': duration}
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = self.open('w')
+            self._file.write(line)
+            self._file.flush()
+            self.entries.setdefault(entry['key'], []).append(entry)
+
+    def play(self, request):
+        """Returns the next recorded response for a request.
+
+        Raises:
+            CassetteError: the call was never recorded.
+        """
+        key = self.key(request.method, request.url, request.body)
+        with self._lock:
+            responses = self.entries.get(key)
+            if not responses:
+                message = "No call recorded in {} for {}".format(self.path, key)
+                raise utils.CassetteError(message)
+            served = self.served.get(key, 0)
+            self.served[key] = served + 1
+        return responses[served % len(responses)]
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends calls with a real adapter and records them to a cassette."""
+
+    def __init__(self, cassette, adapter=None):
+        super(RecordingAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, stream=False, **kwargs):
+        started = time.perf_counter()
+        response = self.adapter.send(request, stream=stream, **kwargs)
+        # the adapter returns once the headers are in, as Session.send times it
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+        body = response.content
+        duration = time.perf_counter() - started
+        self.cassette.record(request, response, body, duration)
+
+        # streamed bodies were read for recording; hand them out again
+        if stream:
+            response.raw = ReplayBody(body)
+            response._content = False
+            response._content_consumed = False
+        return response
+
+    def close(self):
+        self.adapter.close()
+        self.cassette.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers calls from a cassette, without touching the network."""
+
+    def __init__(self, cassette):
+        super(ReplayAdapter, self).__init__()
+        self.cassette = cassette
+
+    def send(self, request, stream=False, **kwargs):
+        entry = self.cassette.play(request)
+        if self.cassette.latency:
+            time.sleep(entry['duration'])
+
+        body = entry['body'].encode('utf-8')
+        if entry['encoding'] == 'base64':
+            body = base64.b64decode(body)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = ReplayBody(body)
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=entry['elapsed'])
+        response.connection = self
+        return response
+
+    def close(self):
+        self.cassette.close()
+
+
+class ReplayBody(io.BytesIO):
+    """Body of a replayed response, standing in for urllib3's HTTPResponse."""
+
+    decode_content = True
+
+    def release_conn(self):
+        pass
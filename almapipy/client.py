@@ -3,22 +3,115 @@ Common Client for interacting with Alma API
 """
 
 import json
+import sys
+import threading
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .metrics import CallEvent, endpoint_template
+from .params import CnxnParams
 from . import utils
 
 
+def build_session(pool_connections=10, pool_maxsize=10, pool_block=False,
+                  keep_alive=True):
+    """Creates a requests Session backed by a pool of persistent connections.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Max number of connections kept open per host.
+        pool_block (bool): If true, wait for a free connection when the
+            per-host pool is exhausted instead of opening a throwaway one.
+        keep_alive (bool): If false, ask the server to close every connection.
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=int(pool_connections),
+                          pool_maxsize=int(pool_maxsize),
+                          pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+class LazySubClient(object):
+    """Attribute building a SubClient from its parent's connection
+    parameters on first access.
+
+    The SubClient is then stored on the parent instance, which shadows this
+    descriptor, so later accesses are plain attribute lookups. Connections
+    only pay for the namespaces they use.
+
+    Args:
+        cls (type or str): SubClient class, or its name in the parent's
+            module for classes defined further down.
+        kwargs: Passed to the SubClient after the connection parameters.
+    """
+
+    _lock = threading.RLock()
+
+    def __init__(self, cls, **kwargs):
+        self.cls = cls
+        self.kwargs = kwargs
+        self.name = None
+        self.owner = None
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with self._lock:
+            client = instance.__dict__.get(self.name)
+            if client is None:
+                if isinstance(self.cls, str):
+                    self.cls = getattr(sys.modules[self.owner.__module__], self.cls)
+                client = self.cls(instance.cnxn_params, **self.kwargs)
+                instance.__dict__[self.name] = client
+        return client
+
+
 class Client(object):
     """
     Reads responses from Alma API and handles response.
     """
 
-    def __init__(self, cnxn_params={}):
-        # instantiate dictionary for storing alma api connection parameters
+    # Overrides the connection's retry policy for this SubClient's calls.
+    retry_policy = None
+
+    def __init__(self, cnxn_params=None):
+        # frozen alma api connection parameters, shared with SubClients
+        if cnxn_params is None:
+            cnxn_params = CnxnParams()
+        elif isinstance(cnxn_params, dict):
+            cnxn_params = CnxnParams(**cnxn_params)
         self.cnxn_params = cnxn_params
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the pooled HTTP session shared by this connection.
+        Every SubClient of the connection uses the same session,
+        so it should only be called once the connection is no longer needed.
+        """
+        session = self.cnxn_params.session
+        if session is not None:
+            session.close()
+
     def create(self, url, data, args, object_type, raw=False):
         """
         Uses requests library to make Exlibris API Post call.
@@ -33,10 +126,15 @@ class Client(object):
         Returns:
             JSON-esque, xml, or raw response.
         """
-        print(url)
+        return self.__timed__('POST', url, self.__create__,
+                              url, data, args, object_type, raw)
 
+    def __create__(self, url, data, args, object_type, raw=False, stats=None):
+        """Makes the Post call of create. See __timed__ for stats."""
         # Determine format of data to be posted according to order of importance:
         # 1) Local declaration, 2) dtype of data parameter, 3) global setting.
+        # args is copied before adding the format: callers may share it
+        # between threads.
         headers = {}
         if 'format' not in args.keys():
             if type(data) == ET or type(data) == ET.Element:
@@ -44,8 +142,8 @@ class Client(object):
             elif type(data) == dict:
                 content_type = 'json'
             else:
-                content_type = self.cnxn_params['format']
-            args['format'] = self.cnxn_params['format']
+                content_type = self.cnxn_params.format
+            args = dict(args, format=self.cnxn_params.format)
         else:
             content_type = args['format']
 
@@ -66,10 +164,11 @@ class Client(object):
             raise utils.ArgError(message)
 
         # Send request and parse response
-        response = requests.post(url, data=data, params=args, headers=headers)
+        response = self.__request__('POST', url, data=data, params=args,
+                                    headers=headers, stats=stats)
         if raw:
             return response
-        content = self.__parse_response__(response)
+        content = self.__parse_response__(response, stats)
 
         return content
 
@@ -86,24 +185,171 @@ class Client(object):
         Returns:
             JSON-esque, xml, or raw response.
         """
+        return self.__timed__('GET', url, self.__read__, url, args, raw)
+
+    def __read__(self, url, args, raw=False, stats=None):
+        """Makes the Get call of read. See __timed__ for stats."""
         # print(url)
 
         # handle data format. Allow for overriding of global setting.
-        data_format = self.cnxn_params['format']
+        # args is copied, not changed: callers may share it between threads.
         if 'format' not in args.keys():
-            args['format'] = data_format
-        data_format = args['format']
+            args = dict(args, format=self.cnxn_params.format)
+
+        # Serve slow-changing endpoints from the connection's cache, if any,
+        # and revalidate stale entries with a conditional request.
+        cache = self.cnxn_params.cache
+        entry = None
+        headers = {}
+        use_cache = cache is not None and not raw
+        if use_cache:
+            ttl = cache.ttl_for(url)
+            use_cache = ttl > 0 or cache.revalidates(url)
+        if use_cache:
+            key = cache.key(url, args)
+            entry = cache.lookup(key)
+            if entry is not None:
+                if entry.fresh:
+                    if stats is not None:
+                        stats['cached'] = True
+                    return entry.value
+                headers = entry.conditional_headers()
 
         # Send request.
-        response = requests.get(url, params=args)
+        response = self.__request__('GET', url, params=args, headers=headers,
+                                    stats=stats)
         if raw:
             return response
 
+        # Unchanged since cached: skip downloading and parsing the body.
+        if response.status_code == 304 and entry is not None:
+            if stats is not None:
+                stats['cached'] = True
+            return cache.renew(key, entry, ttl, response)
+
         # Parse content
-        content = self.__parse_response__(response)
+        content = self.__parse_response__(response, stats)
+        if use_cache:
+            cache.store(key, content, ttl, response)
 
         return content
 
+    def __timed__(self, method, url, call, *args):
+        """Runs call(*args, stats=...) and passes a CallEvent describing it
+        to each metrics hook of the connection. Without hooks, call is run
+        as is and nothing is measured.
+
+        The stats dict is filled in along the way: by __request__ with the
+        response, retries and network time, by __parse_response__ with the
+        parse time, and by the caller if the cache answered.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Exlibris API endpoint url.
+            call (callable): Method making the call.
+            args: Positional arguments of call.
+
+        Returns:
+            What call returns.
+        """
+        hooks = self.cnxn_params.metrics
+        if not hooks:
+            return call(*args)
+
+        stats = {}
+        started = time.perf_counter()
+        error = None
+        try:
+            return call(*args, stats=stats)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.__emit__(hooks, method, url, stats, time.perf_counter() - started, error)
+
+    def __emit__(self, hooks, method, url, stats, total_time, error=None):
+        """Builds the CallEvent of a call from its stats and passes it to hooks."""
+        response = stats.get('response')
+        status = wait_time = download_time = None
+        request_bytes = response_bytes = 0
+        if response is not None:
+            status = response.status_code
+            wait_time = response.elapsed.total_seconds()
+            download_time = max(0.0, stats['network_time'] - wait_time)
+            body = response.request.body
+            request_bytes = len(body) if body else 0
+            if 'response_bytes' in stats:
+                response_bytes = stats['response_bytes']
+            elif response._content is not False:
+                # body already read; streamed bodies are counted as they are read
+                response_bytes = len(response._content or b'')
+        event = CallEvent(method, endpoint_template(url), url, status, request_bytes,
+                          response_bytes, wait_time or 0.0, download_time,
+                          stats.get('parse_time'), total_time, stats.get('retries', 0),
+                          stats.get('cached', False), error)
+        for hook in hooks:
+            hook(event)
+
+    def __request__(self, method, url, stats=None, **kwargs):
+        """Sends a request through the connection's pooled session.
+        Falls back to a one-off request if the client has no session.
+        Waits for the connection's rate limiter, if any, before sending.
+        Transient failures are retried according to the retry policy.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Exlibris API endpoint url.
+            stats (dict): If given, receives the response, the number of
+                retries and the network time of the last attempt.
+            kwargs: Passed through to requests.
+
+        Returns:
+            requests.Response
+        """
+        limiter = self.cnxn_params.rate_limiter
+        session = self.cnxn_params.session
+        policy = self.retry_policy or self.cnxn_params.retry_policy
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+
+            try:
+                sent = time.perf_counter()
+                if session is None:
+                    response = requests.request(method, url, **kwargs)
+                else:
+                    response = session.request(method, url, **kwargs)
+                if stats is not None:
+                    stats['response'] = response
+                    stats['network_time'] = time.perf_counter() - sent
+                    stats['retries'] = attempt
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                # connection reset or timed out before a response arrived
+                delay = None
+                if policy is not None:
+                    delay = policy.next_delay(method, attempt, started)
+                if delay is None:
+                    if stats is not None:
+                        stats['retries'] = attempt
+                    raise
+            else:
+                if limiter is not None:
+                    limiter.update(response)
+                if policy is None or response.status_code < 400:
+                    return response
+                delay = policy.next_delay(method, attempt, started, response)
+                if delay is None:
+                    return response
+                # release the connection of the discarded response
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
     def __format_query__(self, query):
         """Converts dictionary of brief search query to a formated string.
         https://developers.exlibrisgroup.com/blog/How-we-re-building-APIs-at-Ex-Libris#BriefSearch
@@ -129,9 +375,12 @@ class Client(object):
 
         return q_str
 
-    def __read_all__(self, url, args, raw, response, data_key, max_limit=100):
+    def __read_all__(self, url, args, raw, response, data_key, max_limit=100,
+                     max_workers=None):
         """Makes multiple API calls until all records for a query are retrieved.
             Called by the 'all_records' parameter.
+            The total record count is known after the first call, so the
+            remaining pages can be requested in parallel.
 
         Args:
             url (str): Exlibris API endpoint url.
@@ -141,6 +390,9 @@ class Client(object):
             data_key (str): Dictionary key for accessing data.
             max_limit (int): Max number of records allowed to be retrieved in a single call.
                 Overrides limit parameter. Reduces the number of API calls needed to retrieve data.
+            max_workers (int): Number of pages to request at once.
+                Defaults to the connection's max_workers setting.
+                Pages are appended in offset order regardless.
 
         Returns:
             response with remainder of data appended.
@@ -148,10 +400,11 @@ class Client(object):
         # raw will return a list of responses
         if raw:
             responses = [response]
-            response = response.json()
+            response = self.__loads__(response.content)
 
-        args['offset'] = args['limit']
         limit = args['limit']
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
 
         # get total record count of query
         if type(response) == dict:
@@ -161,19 +414,16 @@ class Client(object):
         else:
             total_records = limit
 
-        # set new retrieval limit
-        records_retrieved = limit
-        args['limit'] = max_limit
-        limit = max_limit
+        # remaining pages, retrieved max_limit records at a time
+        offsets = range(int(limit), total_records, max_limit)
 
-        while True:
-            if total_records <= records_retrieved:
-                break
+        def read_page(offset):
+            page_args = args.copy()
+            page_args['offset'] = offset
+            page_args['limit'] = max_limit
+            return self.read(url, page_args, raw=raw)
 
-            # make call and increment counter variables
-            new_response = self.read(url, args, raw=raw)
-            records_retrieved += limit
-            args['offset'] += limit
+        for new_response in utils.imap_bounded(read_page, offsets, max_workers):
 
             # append new records to initial response
             if type(new_response) == dict:
@@ -189,15 +439,154 @@ class Client(object):
 
         return response
 
-    def __parse_response__(self, response):
+    def __iter_all__(self, url, args, data_key, max_limit=100):
+        """Yields the records of a paginated query one at a time.
+            Unlike __read_all__, pages are not accumulated: only the current
+            page is held while the next one is requested in the background.
+
+        Args:
+            url (str): Exlibris API endpoint url.
+            args (dict): Query string parameters for API call.
+            data_key (str): Dictionary key for accessing data.
+            max_limit (int): Number of records requested per call.
+
+        Yields:
+            Records as dicts, or xml Elements if the format is xml.
+        """
+        offset = int(args.get('offset', 0))
+
+        def read_page(offset):
+            page_args = args.copy()
+            page_args['offset'] = offset
+            page_args['limit'] = max_limit
+            return self.read(url, page_args)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = read_page(offset)
+            if type(page) == dict:
+                total_records = int(page.get('total_record_count', 0))
+            else:
+                total_records = int(page.attrib.get('total_record_count', 0))
+
+            while True:
+                # request the next page before handing out this one
+                offset += max_limit
+                next_page = None
+                if offset < total_records:
+                    next_page = executor.submit(read_page, offset)
+
+                if type(page) == dict:
+                    records = page.get(data_key, [])
+                else:
+                    records = list(page)
+                page = None
+                for record in records:
+                    yield record
+
+                if next_page is None:
+                    break
+                page = next_page.result()
+
+    def __stream_xml__(self, url, args, tags):
+        """Makes an API Get call and parses the xml body while it downloads.
+            Neither the body nor the full tree is ever held in memory:
+            matching elements are yielded as soon as they are complete,
+            then cleared and detached from the tree.
+
+        Args:
+            url (str): Exlibris API endpoint url.
+            args (dict): Query string parameters for API call.
+            tags (set): Tags of the elements to yield,
+                e.g. {'bib'} or {'{urn:schemas-microsoft-com:xml-analysis:rowset}Row'}.
+
+        Yields:
+            xml Elements. Copy out what is needed before advancing.
+        """
+        args = args.copy()
+        args['format'] = 'xml'
+
+        # Parsing is interleaved with the download, so its time is
+        # reported as download time rather than parse time.
+        hooks = self.cnxn_params.metrics
+        stats = {} if hooks else None
+        started = time.perf_counter()
+        error = None
+        try:
+            response = self.__request__('GET', url, params=args, stream=True,
+                                        stats=stats)
+            headers_at = time.perf_counter()
+            try:
+                content_type = response.headers.get('Content-Type', '')
+                if response.status_code >= 400 or 'xml' not in content_type:
+                    # errors are small; let the regular parser raise them
+                    self.__parse_response__(response)
+                    return
+
+                response.raw.decode_content = True
+                for elem in self.__iterparse__(response.raw, tags):
+                    yield elem
+            finally:
+                if stats is not None:
+                    stats['network_time'] += time.perf_counter() - headers_at
+                    stats['response_bytes'] = response.raw.tell()
+                response.close()
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            if hooks:
+                self.__emit__(hooks, 'GET', url, stats, time.perf_counter() - started, error)
+
+    def __iterparse__(self, source, tags):
+        """Incrementally parses xml from a file-like object.
+            See __stream_xml__.
+
+        Args:
+            source: File-like object of xml bytes.
+            tags (set): Tags of the elements to yield.
+
+        Yields:
+            xml Elements, cleared once the consumer moves on.
+        """
+        parents = []
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                parents.append(elem)
+                continue
+
+            parents.pop()
+            if elem.tag in tags:
+                yield elem
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+
+    def __loads__(self, data):
+        """Parses a JSON body straight from its bytes, with the connection's
+        JSON backend if one is set."""
+        loads = self.cnxn_params.json_loads or json.loads
+        return loads(data)
+
+    def __parse_response__(self, response, stats=None):
         """Parses alma response depending on content type.
 
         Args:
             response: requests object from Alma.
+            stats (dict): If given, receives the parse time.
 
         Returns:
             Content of response in format specified in header.
         """
+        if stats is None:
+            return self.__parse__(response)
+        started = time.perf_counter()
+        try:
+            return self.__parse__(response)
+        finally:
+            stats['parse_time'] = time.perf_counter() - started
+
+    def __parse__(self, response):
+        """Parses alma response. See __parse_response__."""
         status = response.status_code
         url = response.url
         try:
@@ -210,8 +599,9 @@ class Client(object):
 
         # decode response if xml.
         if response_type == 'application/xml':
-            xml_ns = self.cnxn_params['xml_ns']  # xml namespace
-            content = ET.fromstring(response.text)
+            xml_ns = self.cnxn_params.xml_ns  # xml namespace
+            # parse the bytes directly; xml declares its own encoding
+            content = ET.fromstring(response.content)
 
             # Received response from ex libris, but error retrieving data.
             if str(status)[0] in ['4', '5']:
@@ -227,7 +617,7 @@ class Client(object):
 
         # decode response if json.
         elif response_type == 'application/json':
-            content = response.json()
+            content = self.__loads__(response.content)
 
             # Received response from ex libris, but error retrieving data.
             if str(status)[0] in ['4', '5']:
@@ -1,4 +1,4 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -11,31 +11,29 @@ class SubClientConfiguration(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/conf
     """
 
-    def __init__(self, cnxn_params={}):
+    # Subclients are built on first access.
+    units = LazySubClient('SubClientConfigurationUnits')
+    general = LazySubClient('SubClientConfigurationGeneral')
+    jobs = LazySubClient('SubClientConfigurationJobs')
+    sets = LazySubClient('SubClientConfigurationSets')
+    deposit_profiles = LazySubClient('SubClientConfigurationDeposit')
+    import_profiles = LazySubClient('SubClientConfigurationImport')
+    reminders = LazySubClient('SubClientConfigurationReminders')
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/conf"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/conf"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/37088dc9-c685-4641-bc7f-60b5ca7cabed.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+    def __init__(self, cnxn_params={}):
 
-        # Hook in subclients of api
-        self.units = SubClientConfigurationUnits(self.cnxn_params)
-        self.general = SubClientConfigurationGeneral(self.cnxn_params)
-        self.jobs = SubClientConfigurationJobs(self.cnxn_params)
-        self.sets = SubClientConfigurationSets(self.cnxn_params)
-        self.deposit_profiles = SubClientConfigurationDeposit(self.cnxn_params)
-        self.import_profiles = SubClientConfigurationImport(self.cnxn_params)
-        self.reminders = SubClientConfigurationReminders(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/conf",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/conf",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/37088dc9-c685-4641-bc7f-60b5ca7cabed.wadl")
 
 
 class SubClientConfigurationUnits(Client):
     """Handles the Organization Unit endpoints of Configurations API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get_libaries(self, library_id=None, q_params={}, raw=False):
         """Retrieve a list of libraries or a specific library
@@ -50,9 +48,9 @@ class SubClientConfigurationUnits(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += '/libraries'
         if library_id:
             url += ("/" + str(library_id))
@@ -74,9 +72,9 @@ class SubClientConfigurationUnits(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ('/libraries/' + str(library_id) + "/locations")
         if location_id:
             url += ("/" + str(location_id))
@@ -96,9 +94,9 @@ class SubClientConfigurationUnits(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += '/departments'
 
         response = self.read(url, args, raw=raw)
@@ -109,7 +107,7 @@ class SubClientConfigurationGeneral(Client):
     """Handles the General endpoints of Configurations API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get(self, library_id=None, q_params={}, raw=False):
         """Retrieve general configuration of the institution
@@ -124,9 +122,9 @@ class SubClientConfigurationGeneral(Client):
         """
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += "/general"
 
         response = self.read(url, args, raw=raw)
@@ -150,9 +148,9 @@ class SubClientConfigurationGeneral(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         if library_id:
             url += '/libraries'
@@ -181,9 +179,9 @@ class SubClientConfigurationGeneral(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ('/code-tables/' + str(table_name))
 
         response = self.read(url, args, raw=raw)
@@ -194,9 +192,7 @@ class SubClientConfigurationJobs(Client):
     """Handles the Jobs endpoints of Configurations API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/jobs'
-        self.cnxn_params['api_uri_full'] += '/jobs'
+        self.cnxn_params = cnxn_params.child('/jobs')
 
     def get(self, job_id=None, limit=10, offset=0, all_records=False,
             q_params={}, raw=False):
@@ -217,9 +213,9 @@ class SubClientConfigurationJobs(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         if job_id:
             url += ("/" + str(job_id))
@@ -245,6 +241,25 @@ class SubClientConfigurationJobs(Client):
                                          response=response, data_key='job')
         return response
 
+    def iter(self, q_params={}):
+        """Iterate over every job that can be submitted, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Job records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='job')
+
     def get_instances(self, job_id, instance_id=None, limit=10, offset=0,
                       all_records=False, q_params={}, raw=False):
         """Retrieve all the job instances (runs) for a given job id, or specific instance.
@@ -265,9 +280,9 @@ class SubClientConfigurationJobs(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(job_id) + "/instances")
 
         if instance_id:
@@ -294,6 +309,27 @@ class SubClientConfigurationJobs(Client):
                                          response=response, data_key='job_instance')
         return response
 
+    def iter_instances(self, job_id, q_params={}):
+        """Iterate over every instance (run) of a job, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            job_id (str): Unique id of the job.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Job instances.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += ("/" + str(job_id) + "/instances")
+
+        yield from self.__iter_all__(url, args, data_key='job_instance')
+
 
 class SubClientConfigurationSets(Client):
     """Handles the Sets endpoints of Configurations API
@@ -302,9 +338,7 @@ class SubClientConfigurationSets(Client):
     """
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/sets'
-        self.cnxn_params['api_uri_full'] += '/sets'
+        self.cnxn_params = cnxn_params.child('/sets')
 
     def get(self, set_id=None, content_type=None, set_type=None,
             query={}, limit=10, offset=0, all_records=False,
@@ -331,9 +365,9 @@ class SubClientConfigurationSets(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if set_id:
             url += ("/" + str(set_id))
         else:
@@ -364,6 +398,35 @@ class SubClientConfigurationSets(Client):
                                          response=response, data_key='set')
         return response
 
+    def iter(self, content_type=None, set_type=None, query={}, q_params={}):
+        """Iterate over every set, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            content_type (str): Content type for filtering.
+                Valid values are from the SetContentType code table.
+            set_type (str):	Set type for filtering. 'ITEMIZED' or 'LOGICAL'.
+            query (dict): Search query. Searching for words in created_by or name
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Set records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if content_type:
+            args['content_type'] = str(content_type)
+        if set_type:
+            args['set_type'] = str(set_type)
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='set')
+
     def get_members(self, set_id, limit=10, offset=0, all_records=False,
                     q_params={}, raw=False):
         """Retrieves members of a Set given a Set ID.
@@ -383,9 +446,9 @@ class SubClientConfigurationSets(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(set_id) + "/members")
 
         if int(limit) > 100:
@@ -405,14 +468,33 @@ class SubClientConfigurationSets(Client):
                                          response=response, data_key='member')
         return response
 
+    def iter_members(self, set_id, q_params={}):
+        """Iterate over every member of a Set, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            set_id (str): A unique identifier of the set.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Members of the set.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += ("/" + str(set_id) + "/members")
+
+        yield from self.__iter_all__(url, args, data_key='member')
+
 
 class SubClientConfigurationDeposit(Client):
     """Handles the Deposit profiles endpoints of Configurations API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/deposit-profiles'
-        self.cnxn_params['api_uri_full'] += '/deposit-profiles'
+        self.cnxn_params = cnxn_params.child('/deposit-profiles')
 
     def get(self, deposit_profile_id=None, limit=10, offset=0, all_records=False,
             q_params={}, raw=False):
@@ -433,9 +515,9 @@ class SubClientConfigurationDeposit(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if deposit_profile_id:
             url += ("/" + str(deposit_profile_id))
 
@@ -458,14 +540,31 @@ class SubClientConfigurationDeposit(Client):
             response = self.__read_all__(url=url, args=args, raw=raw,
                                          response=response, data_key='deposit_profile')
 
+    def iter(self, q_params={}):
+        """Iterate over every deposit profile, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Deposit profiles.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='deposit_profile')
+
 
 class SubClientConfigurationImport(Client):
     """Handles the Import profiles endpoints of Configurations API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/md-import-profiles'
-        self.cnxn_params['api_uri_full'] += '/md-import-profiles'
+        self.cnxn_params = cnxn_params.child('/md-import-profiles')
 
     def get(self, profile_id=None, limit=10, offset=0, all_records=False,
             q_params={}, raw=False):
@@ -486,9 +585,9 @@ class SubClientConfigurationImport(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if profile_id:
             url += ("/" + str(profile_id))
 
@@ -512,14 +611,31 @@ class SubClientConfigurationImport(Client):
                                          response=response, data_key='import_profile')
         return response
 
+    def iter(self, q_params={}):
+        """Iterate over every import profile, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Import profiles.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='import_profile')
+
 
 class SubClientConfigurationReminders(Client):
     """Handles the Reminder endpoints of Configurations API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/reminders'
-        self.cnxn_params['api_uri_full'] += '/reminders'
+        self.cnxn_params = cnxn_params.child('/reminders')
 
     def get(self, reminder_id=None, limit=10, offset=0, all_records=False,
             q_params={}, raw=False):
@@ -540,9 +656,9 @@ class SubClientConfigurationReminders(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if reminder_id:
             url += ("/" + str(reminder_id))
 
@@ -565,3 +681,22 @@ class SubClientConfigurationReminders(Client):
             response = self.__read_all__(url=url, args=args, raw=raw,
                                          response=response, data_key='reminder')
         return response
+
+    def iter(self, q_params={}):
+        """Iterate over every reminder, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Reminders.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='reminder')
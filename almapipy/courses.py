@@ -1,4 +1,4 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -10,22 +10,20 @@ class SubClientCourses(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/courses
     """
 
+    # Subclients are built on first access.
+    reading_lists = LazySubClient('SubClientCoursesReadingLists')
+    citations = LazySubClient('SubClientCoursesCitations')
+    owners = LazySubClient('SubClientCoursesOwners')
+    tags = LazySubClient('SubClientCoursesTags')
+
     def __init__(self, cnxn_params={}):
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/courses"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/courses"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/25ede018-da5d-4780-8fda-a8e5d103faba.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
-        #self.cnxn_params['xml_ns']['report'] = 'urn:schemas-microsoft-com:xml-analysis:rowset'
-
-        # Hook in subclients of api
-        self.reading_lists = SubClientCoursesReadingLists(self.cnxn_params)
-        self.citations = SubClientCoursesCitations(self.cnxn_params)
-        self.owners = SubClientCoursesOwners(self.cnxn_params)
-        self.tags = SubClientCoursesTags(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/courses",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/courses",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/25ede018-da5d-4780-8fda-a8e5d103faba.wadl")
+        #self.cnxn_params.xml_ns['report'] = 'urn:schemas-microsoft-com:xml-analysis:rowset'
 
     def get(self, course_id=None, query={}, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -53,9 +51,9 @@ class SubClientCourses(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if course_id:
             url += ("/" + str(course_id))
         else:
@@ -83,14 +81,35 @@ class SubClientCourses(Client):
                                          response=response, data_key='course')
         return response
 
+    def iter(self, query={}, q_params={}):
+        """Iterate over every course in a course list, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            query (dict): Search query for filtering a course list. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Course records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='course')
+
 
 class SubClientCoursesReadingLists(Client):
     """Handles the reading list endpoints of Courses API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, course_id, reading_list_id=None, view='brief', q_params={}, raw=False):
         """Retrieves all Reading Lists, or a specific list, for a Course.
@@ -108,9 +127,9 @@ class SubClientCoursesReadingLists(Client):
                 for a given course ID.
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += str(course_id)
         url += '/reading-lists'
         if reading_list_id:
@@ -127,9 +146,7 @@ class SubClientCoursesCitations(Client):
     """Handles the citations endpoints of Courses API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, course_id, reading_list_id, citation_id=None, q_params={}, raw=False):
         """Retrieves all citations, or a specific citation, for a reading list.
@@ -146,9 +163,9 @@ class SubClientCoursesCitations(Client):
                 for a given reading list ID.
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += str(course_id)
         url += '/reading-lists'
         url += ('/' + str(reading_list_id))
@@ -164,9 +181,7 @@ class SubClientCoursesOwners(Client):
     """Handles the owners endpoints of Courses API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, course_id, reading_list_id, owner_id=None, q_params={}, raw=False):
         """Retrieves all owners, or a specific owner, for a reading list.
@@ -183,9 +198,9 @@ class SubClientCoursesOwners(Client):
                 for a given reading list ID.
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += str(course_id)
         url += '/reading-lists'
         url += ('/' + str(reading_list_id))
@@ -201,9 +216,7 @@ class SubClientCoursesTags(Client):
     """Handles the citation tags endpoints of Courses API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, course_id, reading_list_id, citation_id, q_params={}, raw=False):
         """Retrieves a citation's tag list.
@@ -219,9 +232,9 @@ class SubClientCoursesTags(Client):
             List of a citation's tags in for a given reading list ID.
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += str(course_id)
         url += '/reading-lists'
         url += ('/' + str(reading_list_id))
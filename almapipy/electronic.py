@@ -1,4 +1,6 @@
-from .client import Client
+import requests
+
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -11,29 +13,85 @@ class SubClientElectronic(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/electronic
     """
 
+    # Subclients are built on first access.
+    collections = LazySubClient('SubClientElectronicCollections')
+    services = LazySubClient('SubClientElectronicServices')
+    portfolios = LazySubClient('SubClientElectronicPortfolios')
+
     def __init__(self, cnxn_params={}):
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/electronic"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/electronic"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/e7cf39e9-adce-4be1-aeb9-a31f452960da.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/electronic",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/electronic",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/e7cf39e9-adce-4be1-aeb9-a31f452960da.wadl")
+
+    def crawl(self, query={}, max_workers=None, errors=None):
+        """Walks every e-collection, its e-services and their portfolios,
+            yielding one flat row per portfolio.
+            Services of several collections, and portfolios of several
+            services, are requested at once; every level is paged.
+            Rows are handed out as each service is done, so only the
+            portfolios of the services in flight are held in memory.
+
+        Args:
+            query (dict): Search query for filtering collections. Optional.
+                See collections.get() for searchable fields.
+            max_workers (int): Number of calls made at once per level.
+                Defaults to the connection's max_workers setting.
+            errors (list): If given, failed calls are appended to it as
+                (collection_id, service_id, message) tuples and the crawl
+                goes on. Otherwise the first failure is raised.
+
+        Yields:
+            Portfolio records as dicts, with the 'collection_id' and
+                'service_id' they were found under.
+        """
+        if max_workers is None:
+            max_workers = self.cnxn_params.max_workers
+        json_params = {'format': 'json'}
+
+        def report(collection_id, service_id, error):
+            if errors is None:
+                raise error
+            errors.append((collection_id, service_id, str(error)))
+
+        def read_services(collection):
+            collection_id = str(collection.get('id'))
+            try:
+                response = self.services.get(collection_id, q_params=json_params)
+            except (utils.AlmaError, requests.exceptions.RequestException) as e:
+                report(collection_id, None, e)
+                return []
+            return [(collection_id, str(service.get('id')))
+                    for service in response.get('electronic_service', [])]
 
-        # Hook in subclients of api
-        self.collections = SubClientElectronicCollections(self.cnxn_params)
-        self.services = SubClientElectronicServices(self.cnxn_params)
-        self.portfolios = SubClientElectronicPortfolios(self.cnxn_params)
+        def read_portfolios(ids):
+            collection_id, service_id = ids
+            rows = []
+            try:
+                for portfolio in self.portfolios.iter(collection_id, service_id,
+                                                      q_params=json_params):
+                    row = {'collection_id': collection_id, 'service_id': service_id}
+                    row.update(portfolio)
+                    rows.append(row)
+            except (utils.AlmaError, requests.exceptions.RequestException) as e:
+                report(collection_id, service_id, e)
+            return rows
+
+        collections = self.collections.iter(query=query, q_params=json_params)
+        service_lists = utils.imap_bounded(read_services, collections, max_workers)
+        services = (ids for service_ids in service_lists for ids in service_ids)
+        for rows in utils.imap_bounded(read_portfolios, services, max_workers):
+            for row in rows:
+                yield row
 
 
 class SubClientElectronicCollections(Client):
     """Handles the e-collections endpoints of Electronic API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/e-collections'
-        self.cnxn_params['api_uri_full'] += '/e-collections'
+        self.cnxn_params = cnxn_params.child('/e-collections')
 
     def get(self, collection_id=None, query={}, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -58,9 +116,9 @@ class SubClientElectronicCollections(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if collection_id:
             url += ("/" + str(collection_id))
         else:
@@ -88,14 +146,35 @@ class SubClientElectronicCollections(Client):
                                          response=response, data_key='electronic_collection')
         return response
 
+    def iter(self, query={}, q_params={}):
+        """Iterate over every electronic collection, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            query (dict): Search query for filtering collections. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Electronic collection records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='electronic_collection')
+
 
 class SubClientElectronicServices(Client):
     """Handles the e-services endpoints of Electronic API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/e-collections/'
-        self.cnxn_params['api_uri_full'] += '/e-collections/'
+        self.cnxn_params = cnxn_params.child('/e-collections/')
 
     def get(self, collection_id, service_id=None, q_params={}, raw=False):
         """Returns a list of electronic services for a given electronic collection.
@@ -111,9 +190,9 @@ class SubClientElectronicServices(Client):
                 or a specific e-service.
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += str(collection_id)
         url += '/e-services'
         if service_id:
@@ -126,9 +205,7 @@ class SubClientElectronicPortfolios(Client):
     """Handles the e-services endpoints of Electronic API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/e-collections/'
-        self.cnxn_params['api_uri_full'] += '/e-collections/'
+        self.cnxn_params = cnxn_params.child('/e-collections/')
 
     def get(self, collection_id, service_id, portfolio_id=None, q_params={}, raw=False):
         """Returns a list of portfolios for an electronic services for a given electronic collection.
@@ -145,9 +222,9 @@ class SubClientElectronicPortfolios(Client):
                 or a specific portfolio.
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += str(collection_id)
         url += '/e-services'
         url += ('/' + str(service_id))
@@ -155,3 +232,28 @@ class SubClientElectronicPortfolios(Client):
         if portfolio_id:
             url += ('/' + str(portfolio_id))
         return self.read(url, args, raw=raw)
+
+    def iter(self, collection_id, service_id, q_params={}):
+        """Iterate over every portfolio of an electronic service, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            collection_id (str): Unique ID of the electronic collection.
+            service_id (str): Unique ID of the electronic service.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Portfolio records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += str(collection_id)
+        url += '/e-services'
+        url += ('/' + str(service_id))
+        url += "/portfolios"
+
+        yield from self.__iter_all__(url, args, data_key='portfolio')
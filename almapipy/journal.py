@@ -0,0 +1,127 @@
+"""
+Write-ahead journal making bulk loads resumable
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Journal(object):
+    """Append-only JSON lines file recording the status of each record
+    of a bulk load.
+
+    A record is journaled as pending before it is posted, then as done
+    (with the created ID) or failed. Reusing the journal for a re-run of
+    the same load skips the records already done, so a crashed load
+    resumes where it stopped instead of creating duplicates.
+    A record left pending was in flight during the crash and is posted again.
+
+    E.g.
+    > with Journal('vendor_load.jsonl') as journal:
+    >     for result in alma.bibs.catalog.bulk_post(records, journal=journal):
+    >         ...
+
+    Args:
+        path (str): Path of the journal file. Created if missing.
+        fsync (bool): Force every entry to disk before posting goes on.
+            Protects against power loss as well as crashes, at a cost.
+    """
+
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self.entries = {}  # key -> latest entry
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # last line cut short by a crash
+                        continue
+                    self.entries[entry['key']] = entry
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def get(self, key):
+        """Returns the latest entry of key, or None if never journaled."""
+        return self.entries.get(key)
+
+    def done(self, key):
+        """Whether the record of key was already created."""
+        entry = self.entries.get(key)
+        return entry is not None and entry['status'] == DONE
+
+    def write(self, key, status, created_id=None, error=None):
+        """Appends an entry for key.
+
+        Args:
+            key (str): Key of the record, see record_key.
+            status (str): 'pending', 'done' or 'failed'.
+            created_id (str): ID of the created record.
+            error (str): Message of the failure.
+        """
+        entry = {'key': key, 'status': status, 'created_id': created_id,
+                 'error': error, 'time': time.time()}
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.entries[key] = entry
+
+    def counts(self):
+        """Returns the number of records per status."""
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            entries = list(self.entries.values())
+        for entry in entries:
+            counts[entry['status']] += 1
+        return counts
+
+
+def record_key(operation, args):
+    """Hashes a record of a bulk load into a key that is the same on every
+    run of the load. Identical records share it; bulk_create tells them
+    apart by appending how many came before.
+
+    Args:
+        operation (str): Name of the post call, e.g. 'bibs.catalog.post'.
+        args (tuple): Positional arguments of the post call: payload first,
+            then the IDs it is posted under.
+
+    Returns:
+        str
+    """
+    data = args[0]
+    if type(data) == ET.Element:
+        data = ET.tostring(data, encoding='unicode')
+    elif type(data) != str:
+        data = json.dumps(data, sort_keys=True)
+
+    digest = hashlib.sha1()
+    for part in (operation,) + tuple(str(arg) for arg in args[1:]) + (data,):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -0,0 +1,52 @@
+"""
+Pluggable JSON parsers for decoding API responses
+"""
+
+import json
+
+from . import utils
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# Parsers taking the raw response bytes, fastest first.
+BACKENDS = {}
+if orjson is not None:
+    BACKENDS['orjson'] = orjson.loads
+if ujson is not None:
+    BACKENDS['ujson'] = ujson.loads
+BACKENDS['json'] = json.loads  # detects the encoding of bytes itself
+
+PREFERENCE = ('orjson', 'ujson', 'json')
+
+
+def get_loads(backend='auto'):
+    """Picks the function used to parse JSON response bodies.
+
+    Args:
+        backend (str or callable): 'auto' for the fastest installed parser,
+            'orjson', 'ujson' or 'json' for a given one, or any callable
+            taking bytes and returning python objects.
+
+    Returns:
+        callable
+    """
+    if callable(backend):
+        return backend
+    if backend == 'auto':
+        for name in PREFERENCE:
+            if name in BACKENDS:
+                return BACKENDS[name]
+    if backend not in BACKENDS:
+        message = "JSON backend must be 'auto', a callable, or one of the "
+        message += "installed parsers: " + ", ".join(BACKENDS.keys())
+        raise utils.ArgError(message)
+    return BACKENDS[backend]
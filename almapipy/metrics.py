@@ -0,0 +1,298 @@
+"""
+Per-call timing events, and counters exportable to Prometheus and StatsD
+"""
+
+import collections
+import functools
+import socket
+import threading
+from urllib.parse import urlsplit
+
+
+# One call to the API, as passed to the connection's metrics hooks.
+#   method: HTTP method.
+#   endpoint: path with IDs replaced by {id}, e.g. /almaws/v1/bibs/{id}/holdings.
+#   url: full url called, without the query string.
+#   status: HTTP status of the last attempt, None if no response arrived.
+#   request_bytes: size of the body sent.
+#   response_bytes: size of the body received.
+#   wait_time: seconds from sending the last attempt to its response headers,
+#       connecting included (requests' response.elapsed).
+#   download_time: seconds spent reading the body after the headers.
+#       For streamed calls, parsing happens while downloading and is included.
+#   parse_time: seconds spent parsing the body. None for streamed calls.
+#   total_time: seconds from the call to its result, including rate limiter
+#       waits, failed attempts and backoff.
+#   retries: attempts made before the last one.
+#   cached: True if served from the cache, with or without a 304.
+#   error: class name of the exception the call raised, if any.
+CallEvent = collections.namedtuple('CallEvent', [
+    'method', 'endpoint', 'url', 'status', 'request_bytes', 'response_bytes',
+    'wait_time', 'download_time', 'parse_time', 'total_time', 'retries',
+    'cached', 'error'])
+
+# Path segments of the Alma and Primo APIs that are not IDs.
+STATIC_SEGMENTS = frozenset([
+    'acq', 'almaws', 'amendments', 'analytics', 'bibs', 'booking-availability',
+    'citations', 'code-tables', 'collections', 'conf', 'courses', 'departments',
+    'deposit-profiles', 'deposits', 'e-collections', 'e-services', 'electronic',
+    'fees', 'files', 'funds', 'general', 'holdings', 'instances', 'invoices',
+    'items', 'jobs', 'lending-requests', 'libraries', 'licenses',
+    'linked-open-data', 'loans', 'locations', 'md-import-profiles', 'members',
+    'open-hours', 'owners', 'partners', 'paths', 'po-lines', 'portfolios',
+    'primo', 'reading-lists', 'reminders', 'reports', 'representations',
+    'request-options', 'requested-resources', 'requests', 'rs', 'search',
+    'sets', 'tags', 'task-lists', 'users', 'v1', 'vendors'])
+
+# Upper bounds, in seconds, of the call duration histogram buckets.
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@functools.lru_cache(maxsize=4096)
+def endpoint_template(url):
+    """Replaces the IDs in the path of url by {id}, so that calls to the
+    same endpoint are counted together.
+    Anything before /almaws/ or /primo/, e.g. a proxy prefix, is dropped.
+
+    E.g.
+    > endpoint_template('https://host/almaws/v1/bibs/991234/holdings')
+    '/almaws/v1/bibs/{id}/holdings'
+
+    Args:
+        url (str): Url or path called.
+
+    Returns:
+        str
+    """
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    for i, part in enumerate(parts):
+        if part in ('almaws', 'primo'):
+            parts = parts[i:]
+            break
+    return '/' + '/'.join(part if part in STATIC_SEGMENTS else '{id}' for part in parts)
+
+
+def metric_name(endpoint):
+    """Turns an endpoint template into a dotted StatsD name,
+    e.g. almaws.v1.bibs.id.holdings."""
+    return endpoint.strip('/').replace('/', '.').replace('{id}', 'id') or 'root'
+
+
+def status_label(event):
+    """Status of an event as a label: the HTTP status, 'cached' for a
+    fresh cache hit, or 'error' if no response arrived."""
+    if event.status is not None:
+        return str(event.status)
+    return 'cached' if event.cached else 'error'
+
+
+class Series(object):
+    """Counters of the calls of one method, endpoint and status."""
+
+    __slots__ = ('calls', 'errors', 'retries', 'cached', 'request_bytes',
+                 'response_bytes', 'wait_time', 'download_time', 'parse_time',
+                 'total_time', 'buckets')
+
+    def __init__(self, n_buckets):
+        self.calls = self.errors = self.retries = self.cached = 0
+        self.request_bytes = self.response_bytes = 0
+        self.wait_time = self.download_time = self.parse_time = self.total_time = 0.0
+        self.buckets = [0] * n_buckets
+
+
+class MetricsCollector(object):
+    """Metrics hook aggregating call events per method, endpoint and status.
+
+    E.g.
+    > metrics = MetricsCollector()
+    > alma = AlmaCnxn(your_api_key, metrics=metrics)
+    > ...
+    > metrics.top(5)        # endpoints taking the most time
+    > metrics.prometheus()  # text exposition format, to serve at /metrics
+
+    Args:
+        buckets (tuple): Upper bounds in seconds of the call duration
+            histogram. Defaults to DEFAULT_BUCKETS.
+    """
+
+    def __init__(self, buckets=None):
+        self.bounds = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._series = {}  # (method, endpoint, status) -> Series
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        self.record(event)
+
+    def record(self, event):
+        """Adds a CallEvent to the counters."""
+        key = (event.method, event.endpoint, status_label(event))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = Series(len(self.bounds))
+            series.calls += 1
+            series.errors += bool(event.error) or (event.status or 0) >= 400
+            series.retries += event.retries
+            series.cached += event.cached
+            series.request_bytes += event.request_bytes
+            series.response_bytes += event.response_bytes
+            series.wait_time += event.wait_time
+            series.download_time += event.download_time or 0.0
+            series.parse_time += event.parse_time or 0.0
+            series.total_time += event.total_time
+            for i, bound in enumerate(self.bounds):
+                if event.total_time <= bound:
+                    series.buckets[i] += 1
+                    break
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def series(self):
+        """Returns the counters as a list of dicts, one per method,
+        endpoint and status."""
+        rows = []
+        with self._lock:
+            for (method, endpoint, status), series in self._series.items():
+                row = {'method': method, 'endpoint': endpoint, 'status': status,
+                       'buckets': list(series.buckets)}
+                for name in Series.__slots__[:-1]:
+                    row[name] = getattr(series, name)
+                rows.append(row)
+        return rows
+
+    def top(self, n=10):
+        """Returns the n endpoints with the most time spent in calls,
+        all statuses together.
+
+        Returns:
+            list of dicts with method, endpoint, calls, errors, retries,
+            total_time, mean_time and the time per phase.
+        """
+        totals = collections.OrderedDict()
+        for row in self.series():
+            key = (row['method'], row['endpoint'])
+            total = totals.setdefault(key, {
+                'method': row['method'], 'endpoint': row['endpoint'], 'calls': 0,
+                'errors': 0, 'retries': 0, 'total_time': 0.0, 'wait_time': 0.0,
+                'download_time': 0.0, 'parse_time': 0.0, 'response_bytes': 0})
+            for name in list(total)[2:]:
+                total[name] += row[name]
+        ranked = sorted(totals.values(), key=lambda total: -total['total_time'])[:n]
+        for total in ranked:
+            total['mean_time'] = total['total_time'] / total['calls']
+        return ranked
+
+    def prometheus(self, prefix='almapipy'):
+        """Renders the counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of the metric names.
+
+        Returns:
+            str
+        """
+        rows = self.series()
+        lines = []
+
+        def family(name, kind, description, samples):
+            lines.append('# HELP %s_%s %s' % (prefix, name, description))
+            lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+            for suffix, labels, value in samples:
+                lines.append('%s_%s%s{%s} %s' % (prefix, name, suffix,
+                                                 _labels(labels), _number(value)))
+
+        def labels(row, **extra):
+            pairs = [('method', row['method']), ('endpoint', row['endpoint']),
+                     ('status', row['status'])]
+            return pairs + sorted(extra.items())
+
+        family('calls_total', 'counter', 'Calls to the API.',
+               [('', labels(row), row['calls']) for row in rows])
+        family('errors_total', 'counter', 'Calls that failed.',
+               [('', labels(row), row['errors']) for row in rows])
+        family('retries_total', 'counter', 'Failed attempts retried.',
+               [('', labels(row), row['retries']) for row in rows])
+        family('cached_total', 'counter', 'Calls served from the cache.',
+               [('', labels(row), row['cached']) for row in rows])
+        family('request_bytes_total', 'counter', 'Bytes sent in request bodies.',
+               [('', labels(row), row['request_bytes']) for row in rows])
+        family('response_bytes_total', 'counter', 'Bytes received in response bodies.',
+               [('', labels(row), row['response_bytes']) for row in rows])
+        family('phase_seconds_total', 'counter',
+               'Time spent waiting for headers, downloading and parsing.',
+               [('', labels(row, phase=phase), row[phase + '_time'])
+                for row in rows for phase in ('wait', 'download', 'parse')])
+
+        samples = []
+        for row in rows:
+            count = 0
+            for bound, in_bucket in zip(self.bounds, row['buckets']):
+                count += in_bucket
+                samples.append(('_bucket', labels(row, le=_number(bound)), count))
+            samples.append(('_bucket', labels(row, le='+Inf'), row['calls']))
+            samples.append(('_sum', labels(row), row['total_time']))
+            samples.append(('_count', labels(row), row['calls']))
+        family('call_duration_seconds', 'histogram', 'Duration of calls, retries included.',
+               samples)
+        return '\n'.join(lines) + '\n'
+
+
+class StatsdSink(object):
+    """Metrics hook sending each call event to a StatsD server over UDP.
+
+    Per event, counters of calls, errors, retries and bytes are sent under
+    <prefix>.<endpoint>.<method>.<status>, and timers of each phase under
+    <prefix>.<endpoint>.<method>.time.<phase>. Sending is fire and forget:
+    a missing server never fails a call.
+
+    Args:
+        host (str): StatsD host.
+        port (int): StatsD port.
+        prefix (str): Prefix of the metric names.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='almapipy'):
+        self.address = (host, int(port))
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, event):
+        payload = '\n'.join(self.lines(event)).encode('utf-8')
+        try:
+            self._socket.sendto(payload, self.address)
+        except OSError:
+            pass
+
+    def close(self):
+        self._socket.close()
+
+    def lines(self, event):
+        """Returns the StatsD lines of a CallEvent."""
+        name = '%s.%s.%s' % (self.prefix, metric_name(event.endpoint), event.method)
+        lines = ['%s.%s.calls:1|c' % (name, status_label(event))]
+        if event.error or (event.status or 0) >= 400:
+            lines.append('%s.errors:1|c' % name)
+        if event.retries:
+            lines.append('%s.retries:%d|c' % (name, event.retries))
+        if event.cached:
+            lines.append('%s.cached:1|c' % name)
+        lines.append('%s.response_bytes:%d|c' % (name, event.response_bytes))
+        for phase in ('wait', 'download', 'parse', 'total'):
+            value = getattr(event, phase + '_time')
+            if value is not None:
+                lines.append('%s.time.%s:%.3f|ms' % (name, phase, value * 1000))
+        return lines
+
+
+def _labels(pairs):
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append('%s="%s"' % (name, value))
+    return ','.join(escaped)
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
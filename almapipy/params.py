@@ -0,0 +1,111 @@
+"""
+Immutable connection parameters shared by a connection and its SubClients
+"""
+
+import collections
+from types import MappingProxyType
+
+
+_FIELDS = ('location', 'base_uri', 'format', 'xml_ns', 'api_key', 'session',
+           'max_workers', 'rate_limiter', 'retry_policy', 'cache', 'json_loads',
+           'metrics', 'api_uri', 'api_uri_full', 'web_doc', 'wadl_url')
+
+# Fields before this index are the connection's, shared by every SubClient.
+_ENDPOINT = _FIELDS.index('api_uri')
+
+
+class CnxnParams(collections.namedtuple('CnxnParams', _FIELDS)):
+    """Settings of a connection, and the endpoint a SubClient calls.
+
+    Instances are frozen tuples without a per-instance dict: a SubClient
+    derives its own from its parent's with api() or child(), sharing
+    everything else. Nothing a SubClient does can leak into its parent
+    or siblings, so a connection can be shared between threads.
+
+    Item access (params['api_key'], params.get('max_workers')) is kept
+    for code written against the former dict.
+
+    Args:
+        location (str): Geographic location of library.
+        base_uri (str): Host of the API, e.g. https://api-na.hosted.exlibrisgroup.com
+        format (str): Format of returned data, json or xml.
+        xml_ns (dict): Prefixes of the xml namespaces used in responses.
+        api_key (str): Your Api Key.
+        session (requests.Session): Pooled session shared by all calls.
+        max_workers (int): Calls made at once when reading all records.
+        rate_limiter (RateLimiter): Throttle shared by all calls.
+        retry_policy (RetryPolicy): Retry settings of all calls.
+        cache (Cache): Cache of parsed GET responses.
+        json_loads (callable): Parser of JSON bodies.
+        metrics (tuple): Hooks called with a CallEvent after every call.
+        api_uri (str): Path of the endpoint, e.g. /almaws/v1/users.
+        api_uri_full (str): base_uri + api_uri.
+        web_doc (str): Documentation of the API.
+        wadl_url (str): WADL of the API.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, location='America', base_uri='', format='json', xml_ns=None,
+                api_key=None, session=None, max_workers=1, rate_limiter=None,
+                retry_policy=None, cache=None, json_loads=None, metrics=None,
+                api_uri='', api_uri_full=None, web_doc=None, wadl_url=None):
+        if api_uri_full is None:
+            api_uri_full = base_uri + api_uri
+        xml_ns = MappingProxyType(dict(xml_ns or {}))
+        if callable(metrics):
+            metrics = (metrics,)
+        metrics = tuple(metrics) if metrics else None
+        return super(CnxnParams, cls).__new__(
+            cls, location, base_uri, format, xml_ns, api_key, session,
+            int(max_workers), rate_limiter, retry_policy, cache, json_loads,
+            metrics, api_uri, api_uri_full, web_doc, wadl_url)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+    def keys(self):
+        return self._fields
+
+    def copy(self):
+        # frozen, so sharing is as good as copying
+        return self
+
+    def replace(self, **changes):
+        """Returns new parameters with the given fields changed."""
+        if 'xml_ns' in changes:
+            changes['xml_ns'] = MappingProxyType(dict(changes['xml_ns']))
+        return self._replace(**changes)
+
+    def api(self, api_uri, web_doc=None, wadl_url=None, xml_ns=None):
+        """Parameters of a top-level API, e.g. api('/almaws/v1/users').
+
+        Args:
+            api_uri (str): Path of the API.
+            web_doc (str): Documentation of the API.
+            wadl_url (str): WADL of the API.
+            xml_ns (dict): Namespaces replacing the connection's.
+        """
+        shared = tuple.__getitem__(self, slice(0, _ENDPOINT))
+        if xml_ns is not None:
+            shared = shared[:3] + (MappingProxyType(dict(xml_ns)),) + shared[4:]
+        endpoint = (api_uri, self.base_uri + api_uri, web_doc, wadl_url)
+        return tuple.__new__(CnxnParams, shared + endpoint)
+
+    def child(self, path):
+        """Parameters of an endpoint below this one, e.g. child('/loans')."""
+        shared = tuple.__getitem__(self, slice(0, _ENDPOINT))
+        endpoint = (self.api_uri + path, self.api_uri_full + path,
+                    self.web_doc, self.wadl_url)
+        return tuple.__new__(CnxnParams, shared + endpoint)
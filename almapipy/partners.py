@@ -1,4 +1,4 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -11,18 +11,16 @@ class SubClientPartners(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/partners
     """
 
-    def __init__(self, cnxn_params={}):
+    # Subclients are built on first access.
+    lending_requests = LazySubClient('SubClientPartnersLending')
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/partners"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/partners"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/8883ef41-c3b8-4792-9ff8-cb6b729d6e07.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+    def __init__(self, cnxn_params={}):
 
-        # Hook in subclients of api
-        self.lending_requests = SubClientPartnersLending(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/partners",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/partners",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/8883ef41-c3b8-4792-9ff8-cb6b729d6e07.wadl")
 
     def get(self, partner_id=None, limit=10, offset=0, all_records=False,
             q_params={}, raw=False):
@@ -43,9 +41,9 @@ class SubClientPartners(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if partner_id:
             url += ("/" + str(partner_id))
 
@@ -69,12 +67,31 @@ class SubClientPartners(Client):
                                          response=response, data_key='partner')
         return response
 
+    def iter(self, q_params={}):
+        """Iterate over every Resource Sharing Partner, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Partner records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='partner')
+
 
 class SubClientPartnersLending(Client):
     """Handles the Lending Request endpoints of Resource Sharing Partners API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
+        self.cnxn_params = cnxn_params
 
     def get(self, partner_id, request_id, q_params={}, raw=False):
         """Retrieve a lending request from a specific partner.
@@ -90,9 +107,9 @@ class SubClientPartnersLending(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += ("/" + str(partner_id) + "/lending-requests")
         url += ("/" + str(request_id))
 
@@ -10,13 +10,11 @@ class SubClientPrimoSearch(Client):
 
     def __init__(self, cnxn_params={}):
 
-        # Copy cnnection parameters and add info specific to Bibs.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/primo/v1/search"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/primo/apis/search"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/f5643222-bb88-4f3d-b2d6-5029e527c515.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/primo/v1/search",
+            web_doc="https://developers.exlibrisgroup.com/primo/apis/search",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/f5643222-bb88-4f3d-b2d6-5029e527c515.wadl")
 
     def get(self, query, view_id, tab="default_tab", scope="everything_scope", q_params={}, raw=False):
         """Returns a list of results based on the specified search query
@@ -31,10 +29,10 @@ class SubClientPrimoSearch(Client):
         Returns:
             Returns a list or single portfolio for a Bib.
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['vid'] = str(view_id)
         args['tab'] = str(tab)
         args['scope'] = str(scope)
@@ -0,0 +1,87 @@
+"""
+Pytest fixtures replaying recorded API calls, for tests and benchmarks
+that run without a live tenant
+
+Installed with almapipy and loaded by pytest automatically. Each test
+using the alma fixture gets its own cassette, named after the test:
+    <cassette dir>/<test module>/<test name>.jsonl.gz
+
+    def test_users_pages(alma, benchmark):
+        users = benchmark(alma.users.get, limit=100, all_records=True)
+        assert len(users['user']) == int(users['total_record_count'])
+
+Record the cassettes once against a real tenant (or a StubServer):
+    ALMA_API_KEY=... pytest --almapipy-record
+Then the tests replay them, at full speed unless marked
+@pytest.mark.almapipy_cassette(latency=True). The marker also takes
+name= to share a cassette between tests.
+
+Options:
+    --almapipy-record          Call the API and rewrite the cassettes.
+    --almapipy-cassette-dir    Where cassettes are kept (default: cassettes,
+                               next to the test module).
+Environment:
+    ALMA_API_KEY               Key used when recording.
+    ALMA_BASE_URI              Host called when recording, e.g. a StubServer.
+"""
+
+import os
+
+import pytest
+
+from .cassette import Cassette, RECORD, REPLAY
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('almapipy')
+    group.addoption('--almapipy-record', action='store_true', default=False,
+                    help='Call the Alma API and rewrite the cassettes of the tests run.')
+    group.addoption('--almapipy-cassette-dir', default=None,
+                    help='Directory of the cassettes. Defaults to cassettes/ '
+                         'next to each test module.')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'almapipy_cassette(name=None, latency=False): cassette of the '
+                   'test, and whether replaying waits as long as the recording took.')
+
+
+@pytest.fixture
+def alma_cassette(request):
+    """Cassette of the current test, recording or replaying per --almapipy-record."""
+    marker = request.node.get_closest_marker('almapipy_cassette')
+    options = dict(marker.kwargs) if marker else {}
+
+    directory = request.config.getoption('almapipy_cassette_dir')
+    if directory is None:
+        directory = os.path.join(os.path.dirname(str(request.node.fspath)), 'cassettes')
+    module = request.node.module.__name__.split('.')[-1]
+    name = options.get('name') or request.node.name
+    path = os.path.join(directory, module, name + '.jsonl.gz')
+
+    if request.config.getoption('almapipy_record'):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mode = RECORD
+    elif not os.path.exists(path):
+        pytest.skip('no cassette recorded at %s; run with --almapipy-record' % path)
+    else:
+        mode = REPLAY
+
+    cassette = Cassette(path, mode, latency=options.get('latency', False))
+    yield cassette
+    cassette.close()
+
+
+@pytest.fixture
+def alma(alma_cassette):
+    """AlmaCnxn calling the API through the test's cassette."""
+    from . import AlmaCnxn
+
+    recording = alma_cassette.mode == RECORD
+    api_key = os.environ.get('ALMA_API_KEY') if recording else 'replayed'
+    if not api_key:
+        pytest.fail('set ALMA_API_KEY to record cassettes')
+    base_uri = os.environ.get('ALMA_BASE_URI') if recording else 'http://replayed'
+    with AlmaCnxn(api_key, base_uri=base_uri, cassette=alma_cassette) as cnxn:
+        yield cnxn
@@ -0,0 +1,80 @@
+"""
+Client-side throttling of calls to the Alma API
+"""
+
+import threading
+import time
+
+from . import utils
+
+
+class RateLimiter(object):
+    """Token bucket shared by every SubClient of a connection.
+
+    Alma rejects calls above a per-second threshold with a 429
+    (PER_SECOND_THRESHOLD) and stops answering once the daily quota is used.
+    The limiter spaces calls out to stay under the first, and tracks the
+    daily calls left, as reported in the X-Exl-Api-Remaining header,
+    to stop before the second.
+
+    Args:
+        rate (float): Max calls per second. None disables throttling,
+            but the daily quota is still tracked.
+        burst (int): Max calls allowed back to back. Defaults to rate.
+        quota_floor (int): Refuse to make calls once the daily calls left
+            drop to this number, keeping a reserve for other applications.
+    """
+
+    quota_header = 'X-Exl-Api-Remaining'
+
+    def __init__(self, rate=None, burst=None, quota_floor=0):
+        if rate is not None and float(rate) <= 0:
+            raise utils.ArgError("Rate limit must be a positive number.")
+        self.rate = float(rate) if rate else None
+        self.burst = float(burst or max(1, self.rate or 1))
+        self.quota_floor = int(quota_floor)
+        self.remaining = None  # daily calls left, unknown until first call
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until another call may be made.
+
+        Raises:
+            QuotaError: the daily calls left are at or below quota_floor.
+        """
+        remaining = self.remaining
+        if remaining is not None and remaining <= self.quota_floor:
+            message = "Daily API quota nearly used: {} calls left.".format(remaining)
+            raise utils.QuotaError(message, remaining)
+        if not self.rate:
+            return
+
+        # reserve a token, then sleep outside the lock until it is due
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, response):
+        """Records the quota header of a response and backs off after a 429.
+
+        Args:
+            response: requests object from Alma.
+        """
+        remaining = response.headers.get(self.quota_header)
+        if remaining is not None:
+            try:
+                self.remaining = int(remaining)
+            except ValueError:
+                pass
+
+        if response.status_code == 429 and self.rate:
+            # server says we are too fast: empty the bucket for a second
+            with self._lock:
+                self.tokens = min(self.tokens, -self.rate)
@@ -0,0 +1,87 @@
+"""
+Retrying of transient Alma API failures
+"""
+
+import email.utils
+import random
+import time
+
+from . import utils
+
+
+class RetryPolicy(object):
+    """Decides whether, and after how long, a failed call is retried.
+
+    Waits grow exponentially with full jitter, so concurrent workers that
+    fail together do not retry together. A Retry-After header sent by Alma
+    is honored as the minimum wait.
+
+    Args:
+        max_retries (int): Max number of retries of a single call.
+            0 disables retrying.
+        backoff (float): Base wait in seconds; the cap doubles each retry.
+        max_backoff (float): Longest wait between two tries, in seconds.
+        max_time (float): Give up once this many seconds have been spent
+            on a call, including waits.
+        statuses (tuple): Response codes considered transient.
+        methods (tuple): HTTP methods safe to repeat. POSTs are not retried
+            by default since they may already have created a record.
+        jitter (bool): Randomize waits.
+    """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=30, max_time=120,
+                 statuses=(429, 500, 502, 503, 504), methods=('GET',), jitter=True):
+        if int(max_retries) < 0:
+            raise utils.ArgError("max_retries must be 0 or more.")
+        self.max_retries = int(max_retries)
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.max_time = float(max_time)
+        self.statuses = tuple(statuses)
+        self.methods = tuple(m.upper() for m in methods)
+        self.jitter = jitter
+
+    def next_delay(self, method, attempt, started, response=None):
+        """Returns seconds to wait before retrying, or None to give up.
+
+        Args:
+            method (str): HTTP method of the call.
+            attempt (int): Number of retries made so far.
+            started (float): time.monotonic() of the first try.
+            response: requests object, or None if the connection failed.
+
+        Returns:
+            float or None.
+        """
+        if attempt >= self.max_retries or method.upper() not in self.methods:
+            return None
+        if response is not None and response.status_code not in self.statuses:
+            return None
+
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if response is not None:
+            delay = max(delay, self.retry_after(response))
+
+        if time.monotonic() - started + delay > self.max_time:
+            return None
+        return delay
+
+    @staticmethod
+    def retry_after(response):
+        """Reads the Retry-After header in seconds, 0 if absent or invalid."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return 0
+        try:
+            return max(0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return 0
+        if retry_at is None:
+            return 0
+        return max(0, retry_at.timestamp() - time.time())
@@ -0,0 +1,521 @@
+"""
+Local stand-in for the Alma and Primo APIs, for benchmarks and offline work
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+
+# Records in each collection, unless overridden with StubServer(sizes=...).
+DEFAULT_SIZES = {'users': 1000, 'bibs': 1000, 'holdings': 2, 'items': 5,
+                 'sets': 50, 'members': 1000, 'po-lines': 1000, 'vendors': 200,
+                 'invoices': 500, 'funds': 100, 'report': 5000, 'primo': 500}
+
+ROWSET_NS = 'urn:schemas-microsoft-com:xml-analysis:rowset'
+
+
+def user(i):
+    return {
+        'primary_id': 'user%06d' % i, 'first_name': 'Given', 'last_name': 'Family %d' % i,
+        'full_name': 'Given Family %d' % i, 'user_group': {'value': '01', 'desc': 'Faculty'},
+        'status': {'value': 'ACTIVE', 'desc': 'Active'}, 'expiry_date': '2030-06-30Z',
+        'contact_info': {
+            'address': [{'line1': '%d Shields Ave' % i, 'city': 'Davis', 'postal_code': '95616',
+                         'address_type': [{'value': 'home', 'desc': 'Home'}]}],
+            'email': [{'email_address': 'user%d@example.edu' % i, 'preferred': True}]},
+        'user_identifier': [{'id_type': {'value': 'BARCODE', 'desc': 'Barcode'},
+                             'value': '2%013d' % i, 'status': 'ACTIVE'}],
+        'link': '/almaws/v1/users/user%06d' % i}
+
+
+def number(record_id):
+    """The index of the generated record behind an ID, e.g. 42 for user000042."""
+    digits = re.sub(r'\D', '', record_id)[-6:]
+    return int(digits) if digits else 0
+
+
+def bib(mms_id):
+    i = number(mms_id)
+    marc = ('<record><leader>00000cam a2200000 a 4500</leader>'
+            '<controlfield tag="001">%s</controlfield>'
+            '<datafield tag="245" ind1="1" ind2="0"><subfield code="a">Title %d</subfield>'
+            '</datafield></record>' % (mms_id, i))
+    return {'mms_id': mms_id, 'title': 'Title %d' % i, 'author': 'Author, Some',
+            'isbn': '978%010d' % i, 'network_number': ['(OCoLC)%d' % i],
+            'place_of_publication': 'Davis', 'date_of_publication': '2021',
+            'publisher_const': 'Publisher', 'anies': [marc],
+            'link': '/almaws/v1/bibs/' + mms_id}
+
+
+def holding(mms_id, i):
+    return {'holding_id': '22%s%02d' % (mms_id[-6:], i),
+            'library': {'value': 'MAIN', 'desc': 'Main Library'},
+            'location': {'value': 'STACKS', 'desc': 'Stacks'},
+            'call_number': 'QA76.%d' % i}
+
+
+def item(mms_id, holding_id, i):
+    return {'bib_data': {'mms_id': mms_id},
+            'holding_data': {'holding_id': holding_id},
+            'item_data': {'pid': '23%s%03d' % (holding_id[-8:], i),
+                          'barcode': '3%013d' % i, 'base_status': {'value': '1'},
+                          'physical_material_type': {'value': 'BOOK', 'desc': 'Book'}}}
+
+
+def set_(i):
+    return {'id': '9%09d' % i, 'name': 'Set %d' % i, 'type': {'value': 'ITEMIZED'},
+            'content': {'value': 'BIB_MMS'}, 'status': {'value': 'ACTIVE'},
+            'created_by': {'value': 'admin'}, 'link': '/almaws/v1/conf/sets/9%09d' % i}
+
+
+def member(i):
+    return {'id': '99%06d' % i, 'description': 'Title %d' % i,
+            'link': '/almaws/v1/bibs/99%06d' % i}
+
+
+def po_line(i):
+    return {
+        'number': 'POL-%d' % i, 'type': {'value': 'PRINTED_BOOK_OT', 'desc': 'Print Book - One Time'},
+        'vendor': {'value': 'VEND%d' % (i % 50)}, 'status': {'value': 'ACTIVE'},
+        'price': {'sum': '%d.95' % (i % 200), 'currency': {'value': 'USD'}},
+        'fund_distribution': [{'fund_code': {'value': 'GEN%d' % (i % 7)}, 'percent': 100}],
+        'resource_metadata': {'title': 'A title of some length, volume %d' % i,
+                              'author': 'Author, Some', 'isbn': '978%010d' % i},
+        'location': [{'quantity': 1, 'library': {'value': 'MAIN'},
+                      'shelving_location': 'STACKS', 'copy': [{'barcode': '3%013d' % i}]}],
+        'created_date': '2021-01-01Z', 'link': '/almaws/v1/acq/po-lines/POL-%d' % i}
+
+
+def vendor(i):
+    return {'code': 'VEND%d' % i, 'name': 'Vendor %d' % i, 'status': {'value': 'ACTIVE'},
+            'language': {'value': 'en'}, 'currency': [{'value': 'USD'}]}
+
+
+def invoice(i):
+    return {'id': '77%06d' % i, 'number': 'INV-%d' % i, 'vendor': {'value': 'VEND%d' % (i % 50)},
+            'total_amount': '%d.50' % (i % 900), 'currency': {'value': 'USD'},
+            'invoice_status': {'value': 'ACTIVE'}, 'invoice_date': '2021-02-01Z'}
+
+
+def fund(i):
+    return {'id': '55%06d' % i, 'code': 'GEN%d' % i, 'name': 'General fund %d' % i,
+            'type': {'value': 'ALLOCATED'}, 'status': {'value': 'ACTIVE'},
+            'fiscal_period': {'value': '2021'}}
+
+
+def primo_doc(i):
+    return {'@id': 'https://example/primo/%d' % i, 'context': 'L',
+            'pnx': {'display': {'title': ['Title %d' % i], 'creator': ['Author, Some'],
+                                'type': ['book']},
+                    'control': {'recordid': ['alma99%06d' % i]}}}
+
+
+# Paginated collections: path pattern -> (size key, record key, make record).
+COLLECTIONS = {
+    'users': ('users', 'user', user),
+    'conf/sets': ('sets', 'set', set_),
+    'acq/po-lines': ('po-lines', 'po_line', po_line),
+    'acq/vendors': ('vendors', 'vendor', vendor),
+    'acq/invoices': ('invoices', 'invoice', invoice),
+    'acq/funds': ('funds', 'fund', fund),
+}
+
+
+def to_xml(tag, value):
+    """Renders JSON-like data the way Alma does in xml.
+
+    Lists become repeated elements inside a plural wrapper, and
+    {'value': ..., 'desc': ...} pairs become an element with a desc attribute.
+
+    Args:
+        tag (str): Tag of the element.
+        value: dict, list, or scalar.
+
+    Returns:
+        xml Element
+    """
+    elem = ET.Element(tag)
+    if isinstance(value, dict):
+        if set(value) <= {'value', 'desc'} and 'value' in value:
+            elem.text = str(value['value'])
+            if 'desc' in value:
+                elem.set('desc', str(value['desc']))
+            return elem
+        for key, child in value.items():
+            if key == 'anies':
+                for marc in child:
+                    elem.append(ET.fromstring(marc))
+            elif isinstance(child, list):
+                wrapper = ET.SubElement(elem, key + ('es' if key.endswith('s') else 's'))
+                for entry in child:
+                    wrapper.append(to_xml(key, entry))
+            else:
+                elem.append(to_xml(key, child))
+    elif isinstance(value, bool):
+        elem.text = 'true' if value else 'false'
+    elif value is not None:
+        elem.text = str(value)
+    return elem
+
+
+def report_page(start, n_rows, total, token, schema):
+    """Builds one page of an Analytics report, as Alma sends it."""
+    out = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?><report><QueryResult>']
+    if token:
+        out.append('<ResumptionToken>%s</ResumptionToken>' % token)
+    out.append('<IsFinished>%s</IsFinished><ResultXml><rowset xmlns="%s">'
+               % ('true' if start + n_rows >= total else 'false', ROWSET_NS))
+    if schema:
+        out.append(
+            '<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+            'xmlns:saw-sql="urn:saw-sql" targetNamespace="%s">'
+            '<xsd:complexType name="Row"><xsd:sequence>'
+            '<xsd:element name="Column0" type="xsd:int" saw-sql:columnHeading="0"/>'
+            '<xsd:element name="Column1" type="xsd:string" saw-sql:columnHeading="Title"/>'
+            '<xsd:element name="Column2" type="xsd:string" saw-sql:columnHeading="MMS Id"/>'
+            '<xsd:element name="Column3" type="xsd:int" saw-sql:columnHeading="Loans"/>'
+            '<xsd:element name="Column4" type="xsd:date" saw-sql:columnHeading="Last Loan Date"/>'
+            '<xsd:element name="Column5" type="xsd:decimal" saw-sql:columnHeading="Fines"/>'
+            '</xsd:sequence></xsd:complexType></xsd:schema>' % ROWSET_NS)
+    for i in range(start, start + n_rows):
+        fines = '' if i % 7 else '<Column5>%d.25</Column5>' % (i % 40)
+        out.append('<Row><Column0>0</Column0><Column1>Title %d, a title of some length</Column1>'
+                   '<Column2>99%06d</Column2><Column3>%d</Column3>'
+                   '<Column4>2021-%02d-%02d</Column4>%s</Row>'
+                   % (i, i, i % 30, i % 12 + 1, i % 28 + 1, fines))
+    out.append('</rowset></ResultXml></QueryResult></report>')
+    return ''.join(out).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the endpoints of StubServer. Settings are read from self.server."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_call('GET')
+
+    def do_POST(self):
+        self.handle_call('POST')
+
+    def handle_call(self, method):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip('/')
+        body = None
+        if method == 'POST':
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        server = self.server
+        status = server.inject()
+        if status:
+            return self.send_error_body(status, query, server.ERRORS[status])
+
+        try:
+            route = self.route_post if method == 'POST' else self.route_get
+            result = route(path, query, body)
+        except LookupError as e:
+            return self.send_error_body(400, query, ('INVALID_PARAMETER', str(e)))
+        if result is None:
+            return self.send_error_body(404, query, ('NOT_FOUND', 'No such endpoint: ' + path))
+        tag, content = result
+        if isinstance(content, bytes):
+            return self.send_body(200, content, 'application/xml')
+        self.send_data(200, tag, content, query)
+
+    def route_get(self, path, query, body):
+        """Returns (tag, content) of a GET, or None for unknown paths."""
+        server = self.server
+        sizes = server.sizes
+        match = re.match(r'/(almaws|primo)/v1/(.+)$', path)
+        if match is None:
+            return None
+        api, rest = match.groups()
+        parts = rest.split('/')
+
+        if rest == 'analytics/reports':
+            return 'report', server.report(query)
+        if api == 'primo':
+            if rest != 'search':
+                return None
+            offset, limit = self.page(query, 'primo', max_limit=50)
+            docs = [primo_doc(i) for i in range(offset, offset + limit)]
+            info = {'total': sizes['primo'], 'first': offset + 1, 'last': offset + limit}
+            return 'search', {'info': info, 'docs': docs}
+
+        if rest in COLLECTIONS:
+            size, key, make = COLLECTIONS[rest]
+            offset, limit = self.page(query, size)
+            return self.listing(key, [make(i) for i in range(offset, offset + limit)],
+                                sizes[size])
+        if rest == 'bibs':
+            mms_ids = [mms_id for mms_id in query.get('mms_id', '').split(',') if mms_id]
+            if not 1 <= len(mms_ids) <= 100:
+                raise LookupError('mms_id must list 1-100 IDs')
+            return self.listing('bib', [bib(mms_id) for mms_id in mms_ids], len(mms_ids))
+
+        if parts[0] == 'users' and len(parts) == 2:
+            return 'user', dict(user(number(parts[1])), primary_id=parts[1])
+        if parts[0] == 'bibs' and len(parts) == 2:
+            return 'bib', bib(parts[1])
+        if parts[0] == 'bibs' and len(parts) == 3 and parts[2] == 'holdings':
+            holdings = [holding(parts[1], i) for i in range(sizes['holdings'])]
+            tag, data = self.listing('holding', holdings, len(holdings))
+            data['bib_data'] = {'mms_id': parts[1], 'title': bib(parts[1])['title']}
+            return tag, data
+        if parts[0] == 'bibs' and len(parts) == 5 and parts[2:5:2] == ['holdings', 'items']:
+            offset, limit = self.page(query, 'items')
+            items = [item(parts[1], parts[3], i) for i in range(offset, offset + limit)]
+            return self.listing('item', items, sizes['items'])
+        if parts[:2] == ['conf', 'sets'] and len(parts) == 3:
+            return 'set', dict(set_(number(parts[2])), id=parts[2])
+        if parts[:2] == ['conf', 'sets'] and len(parts) == 4 and parts[3] == 'members':
+            offset, limit = self.page(query, 'members')
+            members = [member(i) for i in range(offset, offset + limit)]
+            return self.listing('member', members, sizes['members'])
+        return None
+
+    def route_post(self, path, query, body):
+        """Echoes the posted record back, with an ID assigned."""
+        new_id = '99%06d' % self.server.next_id()
+        if body[:1] == b'<':
+            record = ET.fromstring(body)
+            if record.tag == 'bib':
+                ET.SubElement(record, 'mms_id').text = new_id
+            elif record.tag == 'holding':
+                ET.SubElement(record, 'holding_id').text = new_id
+            elif record.tag == 'item':
+                item_data = record.find('item_data')
+                if item_data is None:
+                    item_data = ET.SubElement(record, 'item_data')
+                ET.SubElement(item_data, 'pid').text = new_id
+            return record.tag, ET.tostring(record)
+        if not path.startswith('/almaws/v1/'):
+            return None
+        record = json.loads(body)
+        keys = {'users': 'primary_id', 'loans': 'loan_id', 'requests': 'request_id'}
+        key = keys.get(path.rsplit('/', 1)[-1], 'id')
+        record.setdefault(key, new_id)
+        return 'record', record
+
+    def page(self, query, size, max_limit=100):
+        """Returns (offset, number of records) of a page of a collection."""
+        total = self.server.sizes[size]
+        offset = int(query.get('offset', 0))
+        limit = int(query.get('limit', 10))
+        if not 0 <= limit <= max_limit:
+            raise LookupError('limit must be between 0 and %d' % max_limit)
+        offset = min(max(offset, 0), total)
+        return offset, min(limit, total - offset)
+
+    def listing(self, key, records, total):
+        return key + 's', {key: records, 'total_record_count': total}
+
+    def send_data(self, status, tag, data, query):
+        if query.get('format') == 'xml':
+            count = data.pop('total_record_count', None) if tag.endswith('s') else None
+            if count is not None:
+                elem = ET.Element(tag, total_record_count=str(count))
+                for key, records in data.items():
+                    if isinstance(records, list):
+                        for record in records:
+                            elem.append(to_xml(key, record))
+                    else:
+                        elem.append(to_xml(key, records))
+            else:
+                elem = to_xml(tag, data)
+            body = ET.tostring(elem, encoding='UTF-8')
+            return self.send_body(status, body, 'application/xml')
+        self.send_body(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def send_error_body(self, status, query, error):
+        code, message = error
+        if query.get('format') == 'xml':
+            body = ('<web_service_result xmlns="http://com/exlibris/urm/general/xmlbeans">'
+                    '<errorsExist>true</errorsExist><errorList><error>'
+                    '<errorCode>%s</errorCode><errorMessage>%s</errorMessage>'
+                    '</error></errorList></web_service_result>' % (code, message))
+            return self.send_body(status, body.encode('utf-8'), 'application/xml')
+        body = {'errorsExist': True, 'errorList': {'error': [
+            {'errorCode': code, 'errorMessage': message}]}}
+        self.send_body(status, json.dumps(body).encode('utf-8'), 'application/json')
+
+    def send_body(self, status, body, content_type):
+        server = self.server
+        self.send_response(status)
+        self.send_header('Content-Type', content_type + ';charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Exl-Api-Remaining', str(server.remaining()))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server answering like the Alma and Primo APIs,
+    for measuring almapipy without spending the daily API quota.
+
+    Serves generated, paginated JSON and xml for users, bibs (with
+    holdings and items), sets and their members, acquisitions (PO lines,
+    vendors, invoices, funds), Primo search, and Analytics reports paged
+    with a ResumptionToken. Posted records are echoed back with an ID.
+    Calls can be slowed down and made to fail at random.
+
+    E.g.
+    > with StubServer(latency=0.05, throttle_rate=0.01) as stub:
+    >     alma = AlmaCnxn('key', base_uri=stub.base_uri)
+    >     users = alma.users.get(limit=100, all_records=True)
+
+    From a shell: python -m almapipy.stub --port 8080 --latency 0.05
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on. 0 picks a free one.
+        latency (float): Seconds every call waits before answering.
+        jitter (float): Max seconds added to latency at random.
+        error_rate (float): Share of calls answered with a 500.
+        throttle_rate (float): Share of calls answered with a 429
+            PER_SECOND_THRESHOLD error.
+        sizes (dict): Records per collection, overriding DEFAULT_SIZES.
+        daily_quota (int): Starting value of the X-Exl-Api-Remaining header.
+        seed (int): Seed of the random latency and failures.
+    """
+
+    daemon_threads = True
+    request_queue_size = 512
+
+    ERRORS = {
+        429: ('PER_SECOND_THRESHOLD', 'HTTP requests are more than allowed per second'),
+        500: ('INTERNAL_SERVER_ERROR', 'Simulated server error'),
+    }
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0, sizes=None,
+                 daily_quota=1000000, seed=None):
+        HTTPServer.__init__(self, (host, int(port)), StubHandler)
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.error_rate = float(error_rate)
+        self.throttle_rate = float(throttle_rate)
+        self.sizes = dict(DEFAULT_SIZES, **(sizes or {}))
+        self.calls = 0
+        self.daily_quota = int(daily_quota)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = {}  # ResumptionToken -> [next row, rows per page]
+        self._ids = 0
+        self._thread = None
+
+    @property
+    def base_uri(self):
+        host, port = self.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Serves calls from a background thread. Returns the server."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def inject(self):
+        """Counts a call, waits out its latency and draws its failure.
+        Returns the status to fail with, or None."""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            draw = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+        if draw < self.throttle_rate:
+            return 429
+        if draw < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def remaining(self):
+        return max(0, self.daily_quota - self.calls)
+
+    def next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def report(self, query):
+        """Returns the next page of an Analytics report.
+        The token and schema are only sent with the first page, as Alma does."""
+        total = self.sizes['report']
+        token = query.get('token')
+        with self._lock:
+            if token is None:
+                if 'path' not in query:
+                    raise LookupError('path or token is required')
+                start, limit = 0, int(query.get('limit', 25))
+                if not 25 <= limit <= 1000:
+                    raise LookupError('limit must be between 25 and 1000')
+                new_token = 'T%08d' % len(self._tokens)
+            else:
+                if token not in self._tokens:
+                    raise LookupError('Unknown ResumptionToken')
+                start, limit = self._tokens[token]
+                new_token = None
+            n_rows = max(0, min(limit, total - start))
+            self._tokens[token or new_token] = [start + n_rows, limit]
+        schema = token is None and query.get('col_names', 'true').lower() == 'true'
+        return report_page(start, n_rows, total, new_token, schema)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=StubServer.__doc__.split('\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--size', action='append', default=[], metavar='NAME=N',
+                        help='records in a collection, e.g. users=5000')
+    parser.add_argument('--seed', type=int)
+    options = parser.parse_args()
+
+    sizes = {}
+    for size in options.size:
+        name, n = size.split('=')
+        sizes[name] = int(n)
+    server = StubServer(options.host, options.port, options.latency, options.jitter,
+                        options.error_rate, options.throttle_rate, sizes,
+                        seed=options.seed)
+    # first line of output, read by benchmark drivers
+    print(server.base_uri, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -10,28 +10,24 @@ class SubClientTaskList(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/taskslists
     """
 
-    def __init__(self, cnxn_params={}):
+    # Subclients are built on first access.
+    resources = LazySubClient('SubClientTaskListResources')
+    lending = LazySubClient('SubClientTaskListLending')
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/task-lists"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/taskslists"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/d48a1a58-d90c-4eb2-b69f-c17f7a016fd3.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+    def __init__(self, cnxn_params={}):
 
-        # Hook in subclients of api
-        self.resources = SubClientTaskListResources(self.cnxn_params)
-        self.lending = SubClientTaskListLending(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/task-lists",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/taskslists",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/d48a1a58-d90c-4eb2-b69f-c17f7a016fd3.wadl")
 
 
 class SubClientTaskListResources(Client):
     """Handles the requested resources endpoints of Task List API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/requested-resources'
-        self.cnxn_params['api_uri_full'] += '/requested-resources'
+        self.cnxn_params = cnxn_params.child('/requested-resources')
 
     def get(self, library_id, circ_desk, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -55,9 +51,9 @@ class SubClientTaskListResources(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         if int(limit) > 100:
             limit = 100
@@ -79,14 +75,35 @@ class SubClientTaskListResources(Client):
                                          data_key='requested_resource')
         return response
 
+    def iter(self, library_id, circ_desk, q_params={}):
+        """Iterate over every requested resource of a circulation desk, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            library_id (str): The library of the given circulation desk.
+            circ_desk (str): The circulation desk where the action is being performed.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Requested resources.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        args['library'] = str(library_id)
+        args['circ_desk'] = str(circ_desk)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='requested_resource')
+
 
 class SubClientTaskListLending(Client):
     """Handles the requested resources endpoints of Task List API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/rs/lending-requests'
-        self.cnxn_params['api_uri_full'] += '/rs/lending-requests'
+        self.cnxn_params = cnxn_params.child('/rs/lending-requests')
 
     def get(self, library_id, q_params={}, raw=False):
         """Retrieve list of lending requests in Alma.
@@ -102,10 +119,10 @@ class SubClientTaskListLending(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
         args['library'] = str(library_id)
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
 
         response = self.read(url, args, raw=raw)
 
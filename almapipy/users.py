@@ -1,4 +1,4 @@
-from .client import Client
+from .client import Client, LazySubClient
 from . import utils
 
 
@@ -11,21 +11,19 @@ class SubClientUsers(Client):
     For more info: https://developers.exlibrisgroup.com/alma/apis/users
     """
 
-    def __init__(self, cnxn_params={}):
+    # Subclients are built on first access.
+    loans = LazySubClient('SubClientUsersLoans')
+    requests = LazySubClient('SubClientUsersRequests')
+    fees = LazySubClient('SubClientUsersFees')
+    deposits = LazySubClient('SubClientUsersDeposits')
 
-        # Copy cnnection parameters and add info specific to API.
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] = "/almaws/v1/users"
-        self.cnxn_params['web_doc'] = "https://developers.exlibrisgroup.com/alma/apis/users"
-        self.cnxn_params['wadl_url'] = "https://developers.exlibrisgroup.com/resources/wadl/0aa8d36f-53d6-48ff-8996-485b90b103e4.wadl"
-        self.cnxn_params['api_uri_full'] = self.cnxn_params['base_uri']
-        self.cnxn_params['api_uri_full'] += self.cnxn_params['api_uri']
+    def __init__(self, cnxn_params={}):
 
-        # Hook in subclients of api
-        self.loans = SubClientUsersLoans(self.cnxn_params)
-        self.requests = SubClientUsersRequests(self.cnxn_params)
-        self.fees = SubClientUsersFees(self.cnxn_params)
-        self.deposits = SubClientUsersDeposits(self.cnxn_params)
+        # Derive parameters specific to this API from the connection's.
+        self.cnxn_params = cnxn_params.api(
+            "/almaws/v1/users",
+            web_doc="https://developers.exlibrisgroup.com/alma/apis/users",
+            wadl_url="https://developers.exlibrisgroup.com/resources/wadl/0aa8d36f-53d6-48ff-8996-485b90b103e4.wadl")
 
     def get(self, user_id=None, query={}, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -54,9 +52,9 @@ class SubClientUsers(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         if user_id:
             url += ("/" + str(user_id))
         else:
@@ -84,14 +82,35 @@ class SubClientUsers(Client):
                                          response=response, data_key='user')
         return response
 
+    def iter(self, query={}, q_params={}):
+        """Iterate over every user in a user list, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            query (dict): Search query for filtering a user list. Optional.
+                See get() for searchable fields.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            User records.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+        if query:
+            args['q'] = self.__format_query__(query)
+
+        url = self.cnxn_params.api_uri_full
+
+        yield from self.__iter_all__(url, args, data_key='user')
+
 
 class SubClientUsersLoans(Client):
     """Handles the Loans endpoints of Users API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, user_id, loan_id=None, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -113,9 +132,9 @@ class SubClientUsersLoans(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += (str(user_id) + "/loans")
 
         if loan_id:
@@ -140,14 +159,33 @@ class SubClientUsersLoans(Client):
                                          response=response, data_key='item_loan')
         return response
 
+    def iter(self, user_id, q_params={}):
+        """Iterate over every loan of a user, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            user_id (str): 	A unique identifier for the user.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Loans of the user.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += (str(user_id) + "/loans")
+
+        yield from self.__iter_all__(url, args, data_key='item_loan')
+
 
 class SubClientUsersRequests(Client):
     """Handles the Requests endpoints of Users API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, user_id, request_id=None, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -169,9 +207,9 @@ class SubClientUsersRequests(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += (str(user_id) + "/requests")
 
         if request_id:
@@ -196,14 +234,33 @@ class SubClientUsersRequests(Client):
                                          response=response, data_key='user_request')
         return response
 
+    def iter(self, user_id, q_params={}):
+        """Iterate over every request of a user, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            user_id (str): 	A unique identifier for the user.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Requests of the user.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += (str(user_id) + "/requests")
+
+        yield from self.__iter_all__(url, args, data_key='user_request')
+
 
 class SubClientUsersFees(Client):
     """Handles the Fines and Fees endpoints of Users API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, user_id, fee_id=None, q_params={}, raw=False):
         """Retrieve a list of fines and fees for a user.
@@ -218,14 +275,14 @@ class SubClientUsersFees(Client):
             List of fines/fees or a specific fine/fee for a given user.
 
         """
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += (str(user_id))
         url += '/fees'
         if fee_id:
             url += ('/' + str(fee_id))
 
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
         return self.read(url, args, raw=raw)
 
@@ -234,9 +291,7 @@ class SubClientUsersDeposits(Client):
     """Handles the Deposits endpoints of Users API"""
 
     def __init__(self, cnxn_params={}):
-        self.cnxn_params = cnxn_params.copy()
-        self.cnxn_params['api_uri'] += '/'
-        self.cnxn_params['api_uri_full'] += '/'
+        self.cnxn_params = cnxn_params.child('/')
 
     def get(self, user_id, deposit_id=None, limit=10, offset=0,
             all_records=False, q_params={}, raw=False):
@@ -258,9 +313,9 @@ class SubClientUsersDeposits(Client):
 
         """
         args = q_params.copy()
-        args['apikey'] = self.cnxn_params['api_key']
+        args['apikey'] = self.cnxn_params.api_key
 
-        url = self.cnxn_params['api_uri_full']
+        url = self.cnxn_params.api_uri_full
         url += (str(user_id) + "/deposits")
 
         if deposit_id:
@@ -284,3 +339,24 @@ class SubClientUsersDeposits(Client):
             response = self.__read_all__(url=url, args=args, raw=raw,
                                          response=response, data_key='user_deposit')
         return response
+
+    def iter(self, user_id, q_params={}):
+        """Iterate over every deposit of a user, one record at a time.
+            Pages are requested as records are consumed, so memory use
+            stays at about one page however large the result is.
+
+        Args:
+            user_id (str): 	A unique identifier for the user.
+            q_params (dict): Any additional query parameters.
+
+        Yields:
+            Deposits of the user.
+
+        """
+        args = q_params.copy()
+        args['apikey'] = self.cnxn_params.api_key
+
+        url = self.cnxn_params.api_uri_full
+        url += (str(user_id) + "/deposits")
+
+        yield from self.__iter_all__(url, args, data_key='user_deposit')
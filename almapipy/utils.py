@@ -2,6 +2,9 @@
 Error classes and other helpful functions
 """
 
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
 
 class Error(Exception):
     """Base class for exceptions"""
@@ -24,3 +27,90 @@ class ArgError(Error):
     def __init__(self, message):
         super(ArgError, self).__init__(message)
         self.message = "Invalid Argument: " + message
+
+
+class CassetteError(Error):
+    """
+    Raised when replaying a call that the cassette has no recording of
+    """
+
+    def __init__(self, message):
+        super(CassetteError, self).__init__(message)
+        self.message = message
+
+
+class QuotaError(Error):
+    """
+    Raised before a call that would eat into the reserved daily API quota
+    """
+
+    def __init__(self, message, remaining=None):
+        super(QuotaError, self).__init__(message)
+        self.message = message
+        self.remaining = remaining
+
+
+def imap_bounded(func, iterable, max_workers=1):
+    """Lazily maps func over iterable using up to max_workers threads.
+
+    Results are yielded in input order. Only a couple of calls per worker
+    are queued ahead of the consumer, so iterable may be very long.
+
+    Args:
+        func (callable): Called once per item.
+        iterable: Items to map over.
+        max_workers (int): Number of calls to run at once.
+            1 or less runs sequentially in the calling thread.
+
+    Yields:
+        func(item) for each item in iterable.
+    """
+    max_workers = int(max_workers or 1)
+    if max_workers <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = collections.deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # consumer stopped early or a call failed; drop queued work
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def chunked(iterable, size):
+    """Lazily splits iterable into lists of at most size items.
+
+    Args:
+        iterable: Items to split.
+        size (int): Max items per chunk.
+
+    Yields:
+        list of items.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def unique(iterable):
+    """Lazily drops repeated items, keeping first occurrences in order."""
+    seen = set()
+    for item in iterable:
+        if item not in seen:
+            seen.add(item)
+            yield item
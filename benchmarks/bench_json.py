@@ -0,0 +1,92 @@
+"""
+Parse time of JSON response bodies: response.json() (decode to text, then
+the json module, as before) versus each parser reading the bytes directly.
+
+Payloads mimic full pages of users and PO lines (100 records each).
+
+Usage:
+    python benchmarks/bench_json.py [repeat]
+"""
+
+import json
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, '.')
+from almapipy.jsonlib import BACKENDS  # noqa: E402
+
+
+def user(i):
+    return {
+        'primary_id': 'user%06d' % i, 'first_name': 'Given', 'last_name': 'Family %d' % i,
+        'full_name': 'Given Family %d' % i, 'user_group': {'value': '01', 'desc': 'Faculty'},
+        'status': {'value': 'ACTIVE', 'desc': 'Active'}, 'expiry_date': '2030-06-30Z',
+        'contact_info': {
+            'address': [{'line1': '%d Shields Ave' % i, 'city': 'Davis', 'postal_code': '95616',
+                         'address_type': [{'value': 'home', 'desc': 'Home'}],
+                         'preferred': True}],
+            'email': [{'email_address': 'user%d@example.edu' % i, 'preferred': True,
+                       'email_type': [{'value': 'work', 'desc': 'Work'}]}],
+            'phone': [{'phone_number': '530-555-%04d' % (i % 10000), 'preferred': False}]},
+        'user_identifier': [{'id_type': {'value': 'BARCODE', 'desc': 'Barcode'},
+                             'value': '2%013d' % i, 'status': 'ACTIVE'}],
+        'user_statistic': [{'statistic_category': {'value': 'ENG', 'desc': 'Engineering'}}],
+        'user_note': [{'note_text': 'Note éè %d' % i, 'user_viewable': False}],
+        'link': 'https://api-na.hosted.exlibrisgroup.com/almaws/v1/users/user%06d' % i}
+
+
+def po_line(i):
+    return {
+        'number': 'POL-%d' % i, 'type': {'value': 'PRINTED_BOOK_OT', 'desc': 'Print Book - One Time'},
+        'vendor': {'value': 'VEND%d' % (i % 50)}, 'status': {'value': 'ACTIVE'},
+        'price': {'sum': '%d.95' % (i % 200), 'currency': {'value': 'USD'}},
+        'fund_distribution': [{'fund_code': {'value': 'GEN%d' % (i % 7)}, 'percent': 100,
+                               'amount': {'sum': '%d.95' % (i % 200)}}],
+        'resource_metadata': {'title': 'A title of some length, volume %d' % i,
+                              'author': 'Author, Some', 'isbn': '978%010d' % i,
+                              'publisher': 'Publisher', 'publication_year': '2021'},
+        'location': [{'quantity': 1, 'library': {'value': 'MAIN'},
+                      'shelving_location': 'STACKS', 'copy': [{'barcode': '3%013d' % i}]}],
+        'created_date': '2021-01-01Z', 'link': 'https://example/acq/po-lines/POL-%d' % i}
+
+
+def response(payload):
+    r = requests.models.Response()
+    r.status_code = 200
+    r.headers['Content-Type'] = 'application/json;charset=UTF-8'
+    r.encoding = 'UTF-8'
+    r._content = json.dumps(payload).encode('utf-8')
+    return r
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pages = {
+        'users': {'user': [user(i) for i in range(100)], 'total_record_count': 5000},
+        'po_lines': {'po_line': [po_line(i) for i in range(100)], 'total_record_count': 5000},
+    }
+    for name, payload in pages.items():
+        r = response(payload)
+        baseline = timeit(r.json, repeat)
+        print("%s page: %.0f KB" % (name, len(r.content) / 1024.0))
+        print("  %-16s %7.2f ms" % ('response.json()', baseline * 1000))
+        for backend, loads in BACKENDS.items():
+            elapsed = timeit(lambda: loads(r.content), repeat)
+            print("  %-16s %7.2f ms  (%.1fx)" % (backend + '(bytes)', elapsed * 1000,
+                                                 baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Requests/sec against a local stub server with and without connection pooling.
+
+Usage:
+    python benchmarks/bench_pooling.py [n_calls]
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+sys.path.insert(0, '.')
+from almapipy import AlmaCnxn  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = json.dumps({'user': [], 'total_record_count': 0}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(self.body)))
+        if self.headers.get('Connection', '').lower() == 'close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def run(alma, n_calls):
+    start = time.perf_counter()
+    for i in range(n_calls):
+        alma.users.get(str(i))
+    return n_calls / (time.perf_counter() - start)
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_uri = 'http://127.0.0.1:%d' % server.server_address[1]
+
+    with AlmaCnxn('key', base_uri=base_uri, keep_alive=False) as alma:
+        unpooled = run(alma, n_calls)
+    with AlmaCnxn('key', base_uri=base_uri) as alma:
+        pooled = run(alma, n_calls)
+    server.shutdown()
+
+    print("calls:          %d" % n_calls)
+    print("no pooling:     %.0f req/s" % unpooled)
+    print("pooled session: %.0f req/s" % pooled)
+    print("speedup:        %.2fx" % (pooled / unpooled))
+
+
+if __name__ == '__main__':
+    main()
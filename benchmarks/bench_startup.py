@@ -0,0 +1,76 @@
+"""
+Import time of almapipy and construction time of a connection.
+
+Namespaces are built on first access, so constructing a connection that
+uses one namespace is compared against building all of them, which is
+what every construction used to cost.
+
+Usage:
+    python benchmarks/bench_startup.py [n_connections]
+"""
+
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, '.')
+from almapipy import AlmaCnxn, LazySubClient, build_session  # noqa: E402
+
+
+def import_time(repeat=10):
+    best = {}
+    for stmt in ('pass', 'import almapipy'):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.check_call([sys.executable, '-c', stmt], cwd='.')
+            elapsed = time.perf_counter() - start
+            best[stmt] = min(best.get(stmt, elapsed), elapsed)
+    return best['import almapipy'] - best['pass']
+
+
+def namespace_paths(cls, prefix=()):
+    """Lists the attribute paths of every SubClient below cls."""
+    paths = []
+    for name, attr in vars(cls).items():
+        if isinstance(attr, LazySubClient):
+            child = attr.cls
+            if isinstance(child, str):
+                child = getattr(sys.modules[attr.owner.__module__], child)
+            paths.append(prefix + (name,))
+            paths += namespace_paths(child, prefix + (name,))
+    return paths
+
+
+def touch_all(client, paths):
+    """Builds every SubClient below client, parents first."""
+    for path in paths:
+        node = client
+        for name in path:
+            node = getattr(node, name)
+
+
+def per_connection(build, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        build()
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print("import almapipy:            %7.1f ms" % (import_time() * 1000))
+
+    session = build_session()
+    paths = namespace_paths(AlmaCnxn)
+    cases = [
+        ('AlmaCnxn()', lambda: AlmaCnxn('key', session=session)),
+        ('AlmaCnxn().users', lambda: AlmaCnxn('key', session=session).users),
+        ('AlmaCnxn(), all namespaces', lambda: touch_all(AlmaCnxn('key', session=session), paths)),
+        ('AlmaCnxn(), own session', lambda: AlmaCnxn('key')),
+    ]
+    for name, build in cases:
+        print("%-27s %7.1f us" % (name + ':', per_connection(build, n) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
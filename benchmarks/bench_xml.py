@@ -0,0 +1,84 @@
+"""
+Peak RSS and parse time of a large Analytics page: whole-body parsing
+(response.text + ET.fromstring, as before) versus incremental parsing.
+
+Each mode runs in its own process so peak RSS is not shared.
+
+Usage:
+    python benchmarks/bench_xml.py [n_rows]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, '.')
+from almapipy import Client  # noqa: E402
+
+ROW_TAG = "{urn:schemas-microsoft-com:xml-analysis:rowset}Row"
+
+
+def write_report(path, n_rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?><report><QueryResult>'
+                '<IsFinished>true</IsFinished><ResultXml>'
+                '<rowset xmlns="urn:schemas-microsoft-com:xml-analysis:rowset">')
+        for i in range(n_rows):
+            f.write('<Row><Column0>Title of record %d</Column0><Column1>%d</Column1>'
+                    '<Column2>2024-01-01</Column2><Column3>Some Library Name</Column3>'
+                    '<Column4>Call number QA76.%d</Column4></Row>' % (i, i, i))
+        f.write('</rowset></ResultXml></QueryResult></report>')
+
+
+def rows_tree(path):
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8')
+    report = ET.fromstring(text)
+    rows = 0
+    for row in report.iter(ROW_TAG):
+        {col.tag: col.text for col in row}
+        rows += 1
+    return rows
+
+
+def rows_stream(path):
+    rows = 0
+    with open(path, 'rb') as f:
+        for row in Client().__iterparse__(f, {ROW_TAG}):
+            {col.tag: col.text for col in row}
+            rows += 1
+    return rows
+
+
+def child(mode, path):
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    rows = {'tree': rows_tree, 'stream': rows_stream}[mode](path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+    print("%-7s rows=%d  time=%.3fs  peak RSS growth=%.1f MB"
+          % (mode, rows, elapsed, peak / 1024.0))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        return child(sys.argv[2], sys.argv[3])
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    fd, path = tempfile.mkstemp(suffix='.xml')
+    os.close(fd)
+    try:
+        write_report(path, n_rows)
+        print("report: %d rows, %.1f MB" % (n_rows, os.path.getsize(path) / 1e6))
+        for mode in ('tree', 'stream'):
+            subprocess.check_call([sys.executable, __file__, '--child', mode, path])
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+End-to-end benchmarks of the hot paths of almapipy against the local
+stub server (almapipy.stub), so no API quota is spent.
+
+The stub runs in its own process. Each case runs in a fresh process too,
+so that its peak RSS and CPU time are its own. For each case the suite
+reports:
+    calls/s      HTTP calls completed per second of wall time
+    p50, p99     latency of a single HTTP call, body included; for the
+                 streamed analytics calls, the time to the headers
+    peak RSS     peak resident memory of the process running the case
+    CPU/record   user + system CPU time of that process per record
+
+Usage:
+    python benchmarks/run.py [--latency 0.02] [--error-rate 0.01]
+                             [--throttle-rate 0.01] [--workers 8]
+                             [--records 5000] [case ...]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, '.')
+from almapipy import AlmaCnxn, PrimoCnxn, RetryPolicy  # noqa: E402
+
+
+def users_single(alma, n):
+    for i in range(n // 10):
+        alma.users.get('user%06d' % i)
+    return n // 10
+
+
+def users_all_records(alma, n):
+    return len(alma.users.get(limit=100, all_records=True)['user'])
+
+
+def users_all_records_xml(alma, n):
+    alma = AlmaCnxn('key', base_uri=alma.cnxn_params.base_uri, data_format='xml',
+                    max_workers=alma.cnxn_params.max_workers,
+                    retry_policy=alma.cnxn_params.retry_policy,
+                    session=alma.cnxn_params.session)
+    return len(alma.users.get(limit=100, all_records=True))
+
+
+def users_iter(alma, n):
+    return sum(1 for _ in alma.users.iter())
+
+
+def bibs_get_many(alma, n):
+    records, missing = alma.bibs.catalog.get_many('99%06d' % i for i in range(n))
+    return len(records)
+
+
+def bibs_inventory_tree(alma, n):
+    trees = alma.bibs.catalog.get_inventory_tree('99%06d' % i for i in range(n // 10))
+    return sum(len(node['items'] or []) for tree in trees for node in tree['holdings'])
+
+
+def set_members(alma, n):
+    return len(alma.conf.sets.get_members('9000000001', limit=100, all_records=True)['member'])
+
+
+def po_lines(alma, n):
+    return len(alma.acq.po_lines.get(limit=100, all_records=True)['po_line'])
+
+
+def analytics_iter_rows(alma, n):
+    return sum(1 for _ in alma.analytics.reports.iter_rows('/shared/report', limit=1000))
+
+
+def analytics_get_columns(alma, n):
+    columns = alma.analytics.reports.get_columns('/shared/report', limit=1000)
+    return len(next(iter(columns.values())))
+
+
+def primo_search(alma, n):
+    primo = PrimoCnxn('key', base_uri=alma.cnxn_params.base_uri,
+                      session=alma.cnxn_params.session,
+                      retry_policy=alma.cnxn_params.retry_policy)
+    for i in range(n // 50):
+        primo.search.get('any,contains,title %d' % i, 'VID', q_params={'limit': 50})
+    return n // 50 * 50
+
+
+def bibs_bulk_post(alma, n):
+    records = ('<bib><title>Title %d</title></bib>' % i for i in range(n // 10))
+    return sum(1 for result in alma.bibs.catalog.bulk_post(records) if result.created)
+
+
+CASES = [users_single, users_all_records, users_all_records_xml, users_iter,
+         bibs_get_many, bibs_inventory_tree, set_members, po_lines,
+         analytics_iter_rows, analytics_get_columns, primo_search, bibs_bulk_post]
+
+
+def percentile(values, share):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+def run_case(name, base_uri, workers, records):
+    """Runs one case in this process and returns its measurements."""
+    alma = AlmaCnxn('key', base_uri=base_uri, max_workers=workers,
+                    pool_maxsize=max(10, workers),
+                    retry_policy=RetryPolicy(max_retries=10, backoff=0.01))
+
+    # time every HTTP call made through the shared session
+    session = alma.cnxn_params.session
+    latencies = []
+    request = session.request
+
+    def timed_request(*args, **kwargs):
+        start = time.perf_counter()
+        response = request(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return response
+
+    session.request = timed_request
+
+    case = {case.__name__: case for case in CASES}[name]
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    n_records = case(alma, records)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    alma.close()
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    return {'case': name, 'records': n_records, 'calls': len(latencies),
+            'seconds': elapsed, 'calls_per_s': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'rss_mb': rss / 1024.0,
+            'cpu_us_per_record': cpu / max(n_records, 1) * 1e6}
+
+
+def start_stub(options):
+    command = [sys.executable, '-m', 'almapipy.stub', '--port', '0',
+               '--latency', str(options.latency), '--jitter', str(options.jitter),
+               '--error-rate', str(options.error_rate),
+               '--throttle-rate', str(options.throttle_rate), '--seed', '0']
+    for size in ('users', 'members', 'po-lines', 'report', 'primo'):
+        command += ['--size', '%s=%d' % (size, options.records)]
+    stub = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+    base_uri = stub.stdout.readline().strip()
+    return stub, base_uri
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('cases', nargs='*', help='cases to run, all by default')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--json', action='store_true', help='print results as JSON lines')
+    parser.add_argument('--base-uri', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    # a single case, run by the suite in a subprocess
+    if options.base_uri:
+        result = run_case(options.cases[0], options.base_uri, options.workers,
+                          options.records)
+        print(json.dumps(result))
+        return
+
+    names = options.cases or [case.__name__ for case in CASES]
+    stub, base_uri = start_stub(options)
+    try:
+        if not options.json:
+            print("%-24s %8s %7s %9s %9s %9s %8s %12s" % (
+                'case', 'records', 'calls', 'calls/s', 'p50 ms', 'p99 ms',
+                'RSS MB', 'CPU us/rec'))
+        for name in names:
+            command = [sys.executable, __file__, name, '--base-uri', base_uri,
+                       '--workers', str(options.workers),
+                       '--records', str(options.records)]
+            output = subprocess.check_output(command, universal_newlines=True)
+            result = json.loads(output.strip().splitlines()[-1])
+            if options.json:
+                print(json.dumps(result))
+            else:
+                print("%-24s %8d %7d %9.0f %9.2f %9.2f %8.1f %12.1f" % (
+                    name, result['records'], result['calls'], result['calls_per_s'],
+                    result['p50_ms'], result['p99_ms'], result['rss_mb'],
+                    result['cpu_us_per_record']))
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Stress test of one connection shared by many threads.
+
+Hundreds of concurrent calls of every kind (single records, paginated
+all_records reads, iterators, revalidated cache lookups, posts) are
+made through one AlmaCnxn against a local stub server. Every response is
+checked against what the stub was asked for, and the query dicts shared
+by all threads are checked to be untouched afterwards.
+
+Usage:
+    python benchmarks/stress_threads.py [n_calls] [n_threads]
+"""
+
+import copy
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, '.')
+from almapipy import AlmaCnxn, MemoryCache  # noqa: E402
+
+TOTAL_USERS = 250
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers with JSON echoing the path and query of each call."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def query(self):
+        url = urlparse(self.path)
+        return url.path, {k: v[0] for k, v in parse_qs(url.query).items()}
+
+    def do_GET(self):
+        path, query = self.query()
+        headers = {}
+        if path.endswith('/users'):
+            offset, limit = int(query.get('offset', 0)), int(query.get('limit', 10))
+            users = [{'primary_id': 'u%d' % i}
+                     for i in range(offset, min(offset + limit, TOTAL_USERS))]
+            body = {'user': users, 'total_record_count': TOTAL_USERS}
+        elif '/users/' in path:
+            body = {'primary_id': path.rsplit('/', 1)[1], 'query': query}
+        elif '/libraries/' in path:
+            library = path.rsplit('/', 1)[1]
+            headers['ETag'] = '"%s"' % library
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                return self.send(304, None, headers)
+            body = {'code': library}
+        else:
+            return self.send(404, {'errorList': {'error': [
+                {'errorCode': '404', 'errorMessage': path}]}})
+        self.send(200, body, headers)
+
+    def do_POST(self):
+        path, query = self.query()
+        length = int(self.headers.get('Content-Length', 0))
+        data = json.loads(self.rfile.read(length))
+        self.send(200, {'primary_id': data['title'], 'query': query})
+
+    def send(self, status, body, headers={}):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if body is None:
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        data = json.dumps(body).encode()
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+def expect(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def make_calls(alma, shared):
+    """Returns (name, call) pairs; each call checks its own result."""
+    expected_ids = ['u%d' % i for i in range(TOTAL_USERS)]
+
+    def single(i):
+        user = alma.users.get('user%d' % i, q_params=shared)
+        expect(user['primary_id'] == 'user%d' % i, 'wrong user %r' % user)
+        expect(user['query']['view'] == 'full', 'lost query %r' % user)
+
+    def all_records(i):
+        users = alma.users.get(all_records=True, limit=100, q_params=shared)
+        ids = [u['primary_id'] for u in users['user']]
+        expect(ids == expected_ids, 'pages lost or out of order')
+
+    def iterate(i):
+        ids = [u['primary_id'] for u in alma.users.iter(q_params=shared)]
+        expect(ids == expected_ids, 'iterator lost or repeated records')
+
+    def cached(i):
+        library = alma.conf.units.get_libaries('LIB%d' % (i % 5), q_params=shared)
+        expect(library['code'] == 'LIB%d' % (i % 5), 'wrong cached entry %r' % library)
+
+    def read(i):
+        # the shared dict goes straight to Client.read
+        url = alma.users.cnxn_params.api_uri_full + '/direct%d' % i
+        user = alma.users.read(url, shared)
+        expect(user['primary_id'] == 'direct%d' % i, 'wrong user %r' % user)
+
+    def create(i):
+        # as is the payload, straight to Client.create
+        url = alma.users.cnxn_params.api_uri_full
+        user = alma.users.create(url, {'title': 'new%d' % i}, shared, 'user')
+        expect(user['primary_id'] == 'new%d' % i, 'wrong post %r' % user)
+
+    return [('single', single), ('all_records', all_records), ('iter', iterate),
+            ('cached', cached), ('read', read), ('create', create)]
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    n_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_uri = 'http://127.0.0.1:%d' % server.server_address[1]
+
+    # revalidate every lookup so that 304s race with each other
+    cache = MemoryCache(ttls={}, default_ttl=0)
+    shared = {'view': 'full'}
+    before = copy.deepcopy(shared)
+
+    with AlmaCnxn('key', base_uri=base_uri, pool_maxsize=n_threads,
+                  max_workers=4, cache=cache) as alma:
+        calls = make_calls(alma, shared)
+        jobs = [calls[i % len(calls)] for i in range(n_calls)]
+        failures = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            futures = [(name, executor.submit(call, i))
+                       for i, (name, call) in enumerate(jobs)]
+            for name, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append('%s: %s' % (name, e))
+        elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    if shared != before:
+        failures.append('shared q_params changed to %r' % shared)
+    if alma.cnxn_params.xml_ns.keys() != {'header'}:
+        failures.append('connection xml_ns changed')
+
+    print("%d calls on %d threads in %.2f s; cache %s"
+          % (n_calls, n_threads, elapsed, cache.stats()))
+    for failure in failures[:20]:
+        print("FAIL " + failure)
+    if failures:
+        print("%d failures" % len(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
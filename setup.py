@@ -18,6 +18,8 @@ setup(
     author_email="spelkey@ucdavis.edu",
     url='https://github.com/UCDavisLibrary/almapipy',
     install_requires=['requests'],
+    extras_require={'fast': ['orjson']},
+    entry_points={'pytest11': ['almapipy = almapipy.pytest_plugin']},
     python_requires='>=3.0',
     keywords='alma exlibris exlibrisgroup api bibliographic',
     classifiers=[